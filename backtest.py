@@ -0,0 +1,76 @@
+import datetime
+import numpy as np
+import price_store
+import strategies
+import metrics
+
+# -----------------------------------------------------------
+# 벡터화 백테스트 엔진
+#   진입 조건(strategies)은 배열 마스크로 한 번에 계산하고, 청산(+5% / -3%)은
+#   매매 단위로만 앞으로 훑어서 봉 단위 파이썬 루프를 없앤다.
+# -----------------------------------------------------------
+CAPITAL = 1000000
+WARMUP = 60  # MA60 이 채워지는 첫 봉
+
+def add_indicators(df):
+    df['MA20'] = df['Close'].rolling(window=20).mean()
+    df['MA60'] = df['Close'].rolling(window=60).mean()
+    df['Vol_MA5'] = df['Volume'].rolling(window=5).mean()
+    df['Change'] = df['Close'].pct_change()
+    return df
+
+def columns(df):
+    # strategies.entry_mask 에 넘길 (Close, Volume, MA20, MA60, Vol_MA5, Change) 배열
+    return tuple(df[c].to_numpy(dtype=np.float64) for c in ('Close', 'Volume', 'MA20', 'MA60', 'Vol_MA5', 'Change'))
+
+def entry_mask(df, strategy_type, p=strategies.DEFAULT):
+    return strategies.entry_mask(strategy_type, *columns(df), p)
+
+def simulate(dates, prices, close_last, signal, p=strategies.DEFAULT, start=WARMUP):
+    # prices: 정수 종가 배열, signal: 진입 마스크. 보유 중에는 신호를 보지 않고 청산만 확인
+    balance = CAPITAL; shares = 0; trades = []
+    entries = np.flatnonzero(signal[start:]) + start
+    i = start; n = len(prices)
+    while i < n:
+        k = np.searchsorted(entries, i)
+        if k == len(entries): break
+        i = int(entries[k]); price = int(prices[i])
+        shares = balance // price; balance -= shares * price
+        trades.append({"date": dates[i], "type": "BUY", "price": price})
+        if shares == 0:  # 잔고로 1주도 못 사면 기존 루프처럼 다음 신호를 계속 기다림
+            i += 1; continue
+        profit = (prices[i + 1:] - price) / price
+        hit = np.flatnonzero((profit >= p.take_profit) | (profit <= p.stop_loss))
+        if len(hit) == 0: break
+        j = i + 1 + int(hit[0]); exit_price = int(prices[j])
+        balance += shares * exit_price; shares = 0
+        trades.append({"date": dates[j], "type": "SELL", "price": exit_price, "profit": float(profit[hit[0]]) * 100})
+        i = j + 1
+    if shares > 0: balance += shares * close_last
+    return (balance - CAPITAL) / 10000, trades
+
+def int_prices(close):
+    return np.trunc(np.asarray(close, dtype=np.float64)).astype(np.int64)
+
+def backtest_frame(df, strategy_type, p=strategies.DEFAULT):
+    with metrics.stage("backtest.indicators"):
+        add_indicators(df)
+        signal = entry_mask(df, strategy_type, p)
+    with metrics.stage("backtest.simulate"):
+        ret, trades = simulate(df.index, int_prices(df['Close']), df['Close'].iloc[-1] if len(df) else 0, signal, p)
+    return ret, trades, df
+
+def run(code, strategy_type, days=365):
+    df = price_store.load(code, datetime.datetime.now() - datetime.timedelta(days=days))
+    return backtest_frame(df, strategy_type)
+
+def run_batch(codes, strategy_type, days=365):
+    # 여러 종목을 한 번에 백테스트 → {코드: (수익률, trades, df)}.
+    # 저장소만 읽으므로 호출하는 쪽에서 먼저 scanner.refresh_store 로 갱신한다
+    start = datetime.datetime.now() - datetime.timedelta(days=days)
+    results = {}
+    for code in codes:
+        df = price_store.load(code, start, refresh=False)
+        if len(df) == 0: continue
+        results[code] = backtest_frame(df, strategy_type)
+    return results
@@ -0,0 +1,114 @@
+import sys
+import json
+import time
+import zlib
+import functools
+import shutil
+import argparse
+import datetime
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+import price_store
+import fetcher
+import scanner
+import backtest
+import holding
+
+# -----------------------------------------------------------
+# 오프라인 벤치마크 (네트워크 없이 합성 OHLCV 로 측정)
+#   python bench.py [--sizes 200,2500,10000] [--years 1,5,10] [--json out.json]
+#   fdr.DataReader 대신 종목코드로 시드를 고정한 랜덤워크를 돌려주고,
+#   빈 임시 저장소에서 스캔(최초/재스캔) · 백테스트 · 보유기간 분석을 잰다.
+# -----------------------------------------------------------
+STAGES = ("scan_cold", "scan_warm", "backtest", "holding")
+ORIGIN = pd.Timestamp("2005-01-03")  # 합성 시계열의 첫 영업일
+
+@functools.lru_cache(maxsize=4)
+def _calendar(today):
+    # bdate_range 가 느려서 날짜별로 한 번만 만든다
+    return pd.bdate_range(ORIGIN, pd.Timestamp(today), name="Date")
+
+def synthetic_reader(code, start, end=None):
+    # 종목마다 항상 같은 시계열 (영업일, 원 단위 정수 가격, 가끔 거래량 급증).
+    # ORIGIN 부터 만들어 자르므로 start/end 가 달라도 같은 날짜는 같은 값 (증분 갱신 · 백필과 맞물림)
+    rng = np.random.default_rng(zlib.crc32(code.encode()))
+    index = _calendar(datetime.date.today())
+    n = len(index)
+    walk = np.cumsum(rng.normal(0.0003, 0.02, n))
+    close = np.maximum(np.round(rng.uniform(2000, 200000) * np.exp(walk - walk[-1])), 10)  # 오늘 가격 수준을 고정
+    spread = np.abs(rng.normal(0, 0.01, n)) * close
+    volume = rng.lognormal(11, 0.5, n) * np.where(rng.random(n) < 0.05, 3.0, 1.0)
+    df = pd.DataFrame({"Open": close + rng.normal(0, 0.3, n) * spread, "High": close + spread, "Low": close - spread,
+                       "Close": close, "Volume": np.round(volume), "Change": np.r_[np.nan, close[1:] / close[:-1] - 1]}, index=index)
+    return df.loc[pd.Timestamp(start):pd.Timestamp(end) if end is not None else None]
+
+def synthetic_universe(size):
+    return pd.DataFrame({"Code": [f"{i:06d}" for i in range(size)], "Name": [f"종목{i}" for i in range(size)]})
+
+def measure(fn, memory=False):
+    # → (초, 최대 메모리 MB). memory=True 면 tracemalloc 으로 한 번 더 돌려 피크만 잰다
+    started = time.perf_counter(); fn(); elapsed = time.perf_counter() - started
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try: fn()
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] / 2**20; tracemalloc.stop()
+    return elapsed, peak
+
+def run_case(size, years, memory=True):
+    stock_list = synthetic_universe(size)
+    codes = stock_list['Code'].tolist()
+    days = int(years * 365)
+    store_dir = tempfile.mkdtemp(prefix="swing-bench-")
+    saved = (price_store.STORE_DIR, price_store.HISTORY_DAYS, dict(fetcher.HOST_RATE))
+    price_store.STORE_DIR = store_dir; price_store.HISTORY_DAYS = days
+    price_store.set_reader(synthetic_reader)
+    fetcher.HOST_RATE["fdr"] = float("inf"); fetcher._limiters.clear()
+    rows = []
+    try:
+        def holding_all():
+            start = datetime.datetime.now() - datetime.timedelta(days=days)
+            for code in codes: holding.analyze_frame(price_store.load(code, start, refresh=False))
+        stages = {
+            "scan_cold": lambda: scanner.analyze_market_parallel(stock_list),
+            "scan_warm": lambda: scanner.analyze_market_parallel(stock_list),
+            "backtest": lambda: backtest.run_batch(codes, "Sniper", days=days),
+            "holding": holding_all,
+        }
+        for stage in STAGES:
+            # 최초 스캔은 저장소를 채우므로 메모리 측정용 재실행을 하지 않는다
+            elapsed, peak = measure(stages[stage], memory and stage != "scan_cold")
+            rows.append({"stage": stage, "tickers": size, "years": years, "seconds": round(elapsed, 3),
+                         "tickers_per_sec": round(size / elapsed, 1) if elapsed else None,
+                         "peak_mb": round(peak, 1) if peak is not None else None})
+    finally:
+        price_store.STORE_DIR, price_store.HISTORY_DAYS = saved[0], saved[1]
+        fetcher.HOST_RATE.clear(); fetcher.HOST_RATE.update(saved[2]); fetcher._limiters.clear()
+        price_store.set_reader(None)
+        shutil.rmtree(store_dir, ignore_errors=True)
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 데이터로 스캔/백테스트/보유기간 분석 속도를 잽니다.")
+    parser.add_argument("--sizes", default="200,2500,10000", help="종목 수 목록")
+    parser.add_argument("--years", default="1,5,10", help="히스토리 길이(년) 목록")
+    parser.add_argument("--no-memory", action="store_true", help="피크 메모리 측정 생략 (빠름)")
+    parser.add_argument("--json", default=None, help="결과를 JSON 으로 저장할 경로 (CI 비교용)")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for size in [int(s) for s in args.sizes.split(",")]:
+        for years in [float(y) for y in args.years.split(",")]:
+            for row in run_case(size, years, not args.no_memory):
+                rows.append(row)
+                print(f"{row['stage']:<10} {row['tickers']:>6}종목 {row['years']:>4g}년  {row['seconds']:>8.3f}s  "
+                      f"{row['tickers_per_sec'] or 0:>9.1f}종목/s  peak {row['peak_mb'] if row['peak_mb'] is not None else '-'}MB", flush=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f: json.dump(rows, f, ensure_ascii=False, indent=1)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import time
+import hashlib
+import threading
+import collections
+
+# -----------------------------------------------------------
+# 프로세스 전역 캐시 (모듈 전역에 두면 모든 Streamlit 세션이 공유)
+# -----------------------------------------------------------
+def content_key(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8")); h.update(b"\0")
+    return h.hexdigest()
+
+class TTLCache:
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl; self.max_entries = max_entries
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None: return default
+            if item[0] < time.monotonic():
+                del self.data[key]; return default
+            return item[1]
+
+    def set(self, key, value):
+        with self.lock:
+            if key not in self.data and len(self.data) >= self.max_entries: self._evict()
+            self.data[key] = (time.monotonic() + self.ttl, value)
+
+    def _evict(self):
+        # 만료된 것부터 지우고, 그래도 가득 차 있으면 가장 먼저 만료될 항목 제거
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self.data.items() if expires < now]: del self.data[key]
+        if len(self.data) >= self.max_entries: del self.data[min(self.data, key=lambda k: self.data[k][0])]
+
+    def clear(self):
+        with self.lock: self.data.clear()
+
+    def __len__(self):
+        return len(self.data)
+
+class LRUCache:
+    # 용량(바이트) · 개수 상한이 있는 LRU + TTL 캐시. sizeof(value) 로 항목 크기를 추정
+    def __init__(self, max_bytes, ttl=None, max_entries=4096, sizeof=None):
+        self.max_bytes = max_bytes; self.ttl = ttl; self.max_entries = max_entries
+        self.sizeof = sizeof or (lambda value: 0)
+        self.data = collections.OrderedDict()  # key → (만료 시각, 크기, 값)
+        self.bytes = 0; self.hits = 0; self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            item = self.data.get(key)
+            if item is not None and self.ttl is not None and item[0] < time.monotonic():
+                self._drop(key); item = None
+            if item is None:
+                self.misses += 1; return default
+            self.data.move_to_end(key); self.hits += 1
+            return item[2]
+
+    def set(self, key, value):
+        size = self.sizeof(value)
+        if size > self.max_bytes: return
+        with self.lock:
+            if key in self.data: self._drop(key)
+            expires = time.monotonic() + self.ttl if self.ttl is not None else None
+            self.data[key] = (expires, size, value); self.bytes += size
+            while self.data and (self.bytes > self.max_bytes or len(self.data) > self.max_entries):
+                self._drop(next(iter(self.data)))
+
+    def _drop(self, key):
+        _, size, _ = self.data.pop(key); self.bytes -= size
+
+    def clear(self):
+        with self.lock:
+            self.data.clear(); self.bytes = 0
+
+    def __len__(self):
+        return len(self.data)
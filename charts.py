@@ -0,0 +1,96 @@
+import datetime
+import collections
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import price_store
+import backtest
+import scanner
+import metrics
+from cache import LRUCache
+
+# -----------------------------------------------------------
+# 백테스트 차트
+#   (코드, 전략, 마지막 봉 날짜, 기간) 이 같으면 백테스트 결과와 Figure 를 다시 만들지 않는다.
+#   모듈 전역 캐시라 모든 세션이 공유하며, 메모리 상한을 넘으면 오래 안 본 것부터 버린다.
+#   긴 기간은 서버에서 주봉/월봉으로 묶고, 선·마커는 WebGL(Scattergl)로 그린다.
+#   Figure 는 한 번만 HTML 로 직렬화해 캐시하고 그대로 다시 내보낸다
+#   (st.plotly_chart 는 호출마다 검증 + JSON 인코딩을 다시 함).
+# -----------------------------------------------------------
+CACHE_BYTES = 256 * 2**20
+CACHE_TTL = 6 * 60 * 60
+PLOTLY_JS = "cdn"  # 오프라인 서버면 True (plotly.js 를 HTML 에 포함)
+HEIGHT = 400
+# 표시 구간 길이(일) 상한 → 봉 단위. 어느 기간이든 화면의 캔들 수가 대략 400개 안쪽으로 유지된다
+RULES = ((400, None, "일봉"), (2000, pd.offsets.Week(weekday=4), "주봉"), (None, pd.offsets.MonthEnd(), "월봉"))
+
+View = collections.namedtuple("View", ["ret", "trades", "df", "html"])
+
+def _sizeof(view):
+    # df + HTML(직렬화된 차트) + 매매 기록. Figure 는 HTML 로 만든 뒤 버리므로 넣지 않는다
+    return int(view.df.memory_usage(index=True).sum()) + len(view.html) + 256 * len(view.trades)
+
+results = LRUCache(CACHE_BYTES, ttl=CACHE_TTL, sizeof=_sizeof)
+
+def pick_rule(index):
+    span = (index[-1] - index[0]).days if len(index) else 0
+    for limit, rule, label in RULES:
+        if limit is None or span <= limit: return rule, label
+
+def resample_ohlc(df, rule):
+    if rule is None: return df
+    agg = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    if "MA20" in df: agg["MA20"] = "last"
+    return df.resample(rule).agg(agg).dropna(subset=["Close"])
+
+def build_backtest_figure(df, trades, name, years=1):
+    with metrics.stage("chart.build"):
+        rule, label = pick_rule(df.index)
+        bars = resample_ohlc(df, rule)
+        # [야간모드 패치] template='plotly_dark' 추가하여 차트 배경을 어둡게 설정
+        fig = go.Figure(data=[go.Candlestick(x=bars.index, open=bars['Open'], high=bars['High'], low=bars['Low'], close=bars['Close'], name='캔들')])
+        fig.add_trace(go.Scattergl(x=bars.index, y=bars['MA20'], mode='lines', line=dict(color='#FFA500'), name='20일선')) # 오렌지색
+        
+        buy_x = [t['date'] for t in trades if t['type'] == 'BUY']; buy_y = [t['price'] for t in trades if t['type'] == 'BUY']
+        sell_x = [t['date'] for t in trades if t['type'] == 'SELL']; sell_y = [t['price'] for t in trades if t['type'] == 'SELL']
+        
+        fig.add_trace(go.Scattergl(x=buy_x, y=buy_y, mode='markers', marker=dict(color='#FF6B6B', size=10, symbol='triangle-up'), name='매수')) # 연한 빨강
+        fig.add_trace(go.Scattergl(x=sell_x, y=sell_y, mode='markers', marker=dict(color='#4DABF7', size=10, symbol='triangle-down'), name='매도')) # 연한 파랑
+        
+        fig.update_layout(height=HEIGHT, title=f"{name} {years}년 백테스팅 ({label})", xaxis_rangeslider_visible=False, template='plotly_dark')
+    return fig
+
+def build_overlay_figure(frames, years=1):
+    # 여러 종목 종가를 시작일 대비 % 로 겹쳐 그림 → {이름: df}
+    with metrics.stage("chart.build"):
+        fig = go.Figure()
+        for name, df in frames.items():
+            if len(df) == 0: continue
+            rule, label = pick_rule(df.index)
+            close = resample_ohlc(df, rule)['Close']
+            fig.add_trace(go.Scattergl(x=close.index, y=(close / close.iloc[0] - 1) * 100, mode='lines', name=name))
+        fig.update_layout(height=HEIGHT, title=f"{years}년 수익률 비교 (%)", template='plotly_dark')
+    return fig
+
+def to_html(fig):
+    return pio.to_html(fig, include_plotlyjs=PLOTLY_JS, full_html=False, config={"displaylogo": False})
+
+def last_bar(code):
+    # (마지막 봉 날짜, 종가) — 장중에 저장된 봉이 확정 종가로 바뀌어도 캐시 키가 달라지게 종가까지 포함
+    price_store.update(code)
+    stored = price_store.read_arrays(code)
+    return (int(stored[0][-1]), float(stored[1][3, -1])) if stored is not None and len(stored[0]) else None
+
+def backtest_view(code, name, strategy_type, years=1):
+    # → View(수익률, trades, df, html). 캐시에 있으면 그대로 반환.
+    # 과거 구간 보충이 실패하면 저장된 만큼으로 그리되 캐시하지 않아 다음 클릭 때 다시 받는다
+    filled = scanner.backfill_store([code], datetime.date.today() - datetime.timedelta(days=int(years * 365)))[code]
+    key = (code, strategy_type, last_bar(code), years)
+    hit = results.get(key)
+    metrics.incr("cache", cache="backtest_chart", result="miss" if hit is None else "hit")
+    if hit is not None: return hit
+    ret, trades, df = backtest.run(code, strategy_type, days=int(years * 365))
+    fig = build_backtest_figure(df, trades, name, years)
+    view = View(ret, trades, df, to_html(fig))
+    if filled.status == "ok": results.set(key, view)
+    return view
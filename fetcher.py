@@ -0,0 +1,131 @@
+import time
+import random
+import threading
+import collections
+import concurrent.futures
+import requests
+from requests.adapters import HTTPAdapter
+import metrics
+
+# -----------------------------------------------------------
+# 수집 파이프라인 (동시성 제한 + 호스트별 속도 제한 + 재시도)
+#   종목마다 FetchResult 를 돌려주므로 "신호 없음"과 "다운로드 실패"를 구분할 수 있다.
+#   status: ok / empty / timeout / throttled / error
+# -----------------------------------------------------------
+FetchResult = collections.namedtuple("FetchResult", ["code", "status", "value", "error", "attempts", "elapsed"])
+
+HOST_RATE = {"fdr": 20.0}  # 초당 요청 수
+DEFAULT_RATE = 5.0
+MIN_WORKERS, START_WORKERS, MAX_WORKERS = 2, 8, 32
+RETRIES = 3
+BACKOFF = 0.5  # 초, 시도마다 2배 + 지터
+
+class RateLimiter:
+    # 토큰 버킷: 초당 rate 개, 최대 burst 개까지 몰아서 허용
+    def __init__(self, rate, burst=None):
+        self.rate = rate; self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst; self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate); self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1; return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_limiters = {}
+_limiters_guard = threading.Lock()
+
+def limiter(host):
+    with _limiters_guard:
+        if host not in _limiters: _limiters[host] = RateLimiter(HOST_RATE.get(host, DEFAULT_RATE))
+        return _limiters[host]
+
+class AdaptiveLimit:
+    # AIMD 동시성 제어: 연속 성공하면 1씩 늘리고, 타임아웃/쓰로틀이면 절반으로 줄인다
+    def __init__(self, start=START_WORKERS, low=MIN_WORKERS, high=MAX_WORKERS):
+        self.limit = start; self.low = low; self.high = high
+        self.active = 0; self.streak = 0
+        self.cond = threading.Condition()
+
+    def __enter__(self):
+        with self.cond:
+            while self.active >= self.limit: self.cond.wait()
+            self.active += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self.cond:
+            self.active -= 1; self.cond.notify_all()
+
+    def success(self):
+        with self.cond:
+            self.streak += 1
+            if self.streak >= self.limit and self.limit < self.high:
+                self.limit += 1; self.streak = 0; self.cond.notify_all()
+
+    def backoff(self):
+        with self.cond:
+            self.limit = max(self.low, self.limit // 2); self.streak = 0
+
+_session = None
+_session_guard = threading.Lock()
+
+def session():
+    # 직접 HTTP 를 쓰는 곳(뉴스 등)이 공유하는 커넥션 풀
+    global _session
+    with _session_guard:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+            _session.mount("http://", adapter); _session.mount("https://", adapter)
+            _session.headers.update({'User-Agent': 'Mozilla/5.0'})
+        return _session
+
+def classify(exc):
+    if isinstance(exc, (requests.Timeout, TimeoutError)): return "timeout"
+    response = getattr(exc, "response", None)
+    code = getattr(response, "status_code", None)
+    if code in (429, 503) or "429" in str(exc) or "Too Many" in str(exc): return "throttled"
+    return "error"
+
+def _fetch_one(code, fn, host, gate):
+    result = _attempt(code, fn, host, gate)
+    metrics.observe("fetch_latency_seconds", result.elapsed)
+    metrics.incr("fetch", status=result.status)
+    if result.attempts > 1: metrics.incr("fetch_retries", result.attempts - 1)
+    return result
+
+def _attempt(code, fn, host, gate):
+    started = time.monotonic(); error = None; status = "error"
+    for attempt in range(1, RETRIES + 1):
+        limiter(host).acquire()
+        try:
+            with gate: value = fn(code)
+        except Exception as e:
+            error = e; status = classify(e)
+            if status != "error": gate.backoff()
+            if attempt < RETRIES: time.sleep(BACKOFF * 2 ** (attempt - 1) * (1 + random.random()))
+            continue
+        gate.success()
+        status = "empty" if value is None or (hasattr(value, "__len__") and len(value) == 0) else "ok"
+        return FetchResult(code, status, value, None, attempt, time.monotonic() - started)
+    return FetchResult(code, status, None, repr(error), RETRIES, time.monotonic() - started)
+
+def fetch_many(codes, fn, host="fdr"):
+    # fn(code) 를 모든 종목에 대해 실행 → {코드: FetchResult}
+    gate = AdaptiveLimit()
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(_fetch_one, code, fn, host, gate) for code in codes]
+        for future in concurrent.futures.as_completed(futures):
+            res = future.result(); results[res.code] = res
+    return results
+
+def summarize(results):
+    # 상태별 종목 수
+    return dict(collections.Counter(r.status for r in results.values()))
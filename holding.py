@@ -0,0 +1,69 @@
+import datetime
+import numpy as np
+import pandas as pd
+import price_store
+import scanner
+
+# -----------------------------------------------------------
+# 보유 기간 최적화 엔진 (선행 수익률 행렬)
+#   신호일 × 보유기간 수익률을 shift 된 종가 배열로 한 번에 만든다.
+#   R[k, j] = (종가[신호k + 기간j] - 종가[신호k]) / 종가[신호k] * 100  (기간이 데이터 밖이면 NaN)
+# -----------------------------------------------------------
+HOLDING_DAYS = [5, 10, 20, 40, 60, 90]
+LOOKBACK_DAYS = 730
+MIN_BARS = 200
+
+def period_label(days):
+    return f"{days//5}주"
+
+def signal_index(close):
+    # 종가가 20일선을 상향 돌파한 봉의 위치
+    ma20 = close.rolling(20).mean(); prev = close.shift(1)
+    buy = (close > ma20) & (prev <= prev.rolling(20).mean())
+    return np.flatnonzero(buy.to_numpy())
+
+def forward_returns(close, idx, horizons=HOLDING_DAYS):
+    close = np.asarray(close, dtype=np.float64); h = np.asarray(horizons)
+    target = idx[:, None] + h[None, :]
+    valid = target < len(close)
+    future = close[np.where(valid, target, 0)]
+    base = close[idx][:, None]
+    return np.where(valid, (future - base) / base * 100, np.nan)
+
+def characterize(df):
+    volatility = df['Close'].pct_change().abs().mean() * 100
+    trend_ratio = (df['Close'] > df['Close'].rolling(60).mean()).sum() / len(df)
+    return "🚀 모멘텀형" if volatility > 2.5 else "🧱 누적형" if trend_ratio > 0.6 else "🎢 이벤트형"
+
+def summarize(matrix, horizons=HOLDING_DAYS):
+    # 신호는 시간순이라 기간별 유효 행은 항상 앞쪽 연속 구간 → 그 구간만 평균 (기존 np.mean 과 같은 값)
+    results = {}
+    for j, days in enumerate(horizons):
+        n = int(np.count_nonzero(~np.isnan(matrix[:, j])))
+        if n: results[period_label(days)] = np.mean(matrix[:n, j])
+    return results
+
+def analyze_frame(df):
+    if len(df) < MIN_BARS: return None, None, None, "데이터가 부족합니다."
+    char_type = characterize(df)
+    results = summarize(forward_returns(df['Close'], signal_index(df['Close'])))
+    if not results: return None, None, None, "매매 기회 부족"
+    best_period = max(results, key=results.get)
+    return char_type, results, best_period, None
+
+def rank_universe(stock_list):
+    # 전체 종목의 최적 보유 기간을 한 번에 계산 → 최적 수익률 내림차순 DataFrame
+    #   수집은 scanner.refresh_store(속도 제한 · 재시도 · 종목별 상태)로 하고, 계산은 저장소만 읽는다
+    names = dict(zip(stock_list['Code'], stock_list['Name']))
+    status = scanner.refresh_store(names)
+    start = datetime.datetime.now() - datetime.timedelta(days=LOOKBACK_DAYS)
+    rows = []
+    for code, name in names.items():
+        if status[code].status != "ok": continue
+        char_type, results, best_period, err = analyze_frame(price_store.load(code, start, refresh=False))
+        if err: continue
+        row = {"종목명": name, "코드": code, "특성": char_type, "최적기간": best_period, "최적수익률": round(results[best_period], 2)}
+        row.update({k: round(v, 2) for k, v in results.items()})
+        rows.append(row)
+    if not rows: return pd.DataFrame()
+    return pd.DataFrame(rows).sort_values("최적수익률", ascending=False).reset_index(drop=True)
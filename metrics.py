@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import threading
+import contextlib
+
+# -----------------------------------------------------------
+# 핫패스 계측 (단계별 타이머 · 지연 히스토그램 · 카운터)
+#   꺼져 있으면 stage() 는 공유 nullcontext, observe()/incr() 는 바로 return 이라 비용이 거의 없다.
+#   켜기: 사이드바 '🩺 진단' 또는 환경변수 SWING_METRICS=1
+#   내보내기: to_json() / to_prometheus()
+# -----------------------------------------------------------
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "swing"
+
+_enabled = os.environ.get("SWING_METRICS") == "1"
+_lock = threading.Lock()
+_stages = {}     # 이름 → [호출 수, 합계 초, 최대 초]
+_histograms = {} # 이름 → [버킷별 개수..., +Inf 개수, 합계]
+_counters = {}   # (이름, ((라벨, 값), ...)) → 개수
+_NULL = contextlib.nullcontext()
+
+def enabled():
+    return _enabled
+
+def enable(on=True):
+    global _enabled
+    _enabled = bool(on)
+
+def reset():
+    with _lock:
+        _stages.clear(); _histograms.clear(); _counters.clear()
+
+class _Stage:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        with _lock:
+            s = _stages.setdefault(self.name, [0, 0.0, 0.0])
+            s[0] += 1; s[1] += elapsed; s[2] = max(s[2], elapsed)
+
+def stage(name):
+    # with metrics.stage("scan.fetch"): ...
+    return _Stage(name) if _enabled else _NULL
+
+def observe(name, value):
+    if not _enabled: return
+    with _lock:
+        h = _histograms.setdefault(name, [0] * (len(BUCKETS) + 1) + [0.0])
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                h[i] += 1; break
+        else: h[len(BUCKETS)] += 1
+        h[-1] += value
+
+def incr(name, n=1, **labels):
+    if not _enabled: return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock: _counters[key] = _counters.get(key, 0) + n
+
+def snapshot():
+    with _lock:
+        stages = {k: {"calls": v[0], "total_s": v[1], "max_s": v[2]} for k, v in _stages.items()}
+        histograms = {k: {"buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], v[:-1])), "count": sum(v[:-1]), "sum_s": v[-1]} for k, v in _histograms.items()}
+        counters = [{"name": k[0], "labels": dict(k[1]), "value": v} for k, v in _counters.items()]
+    return {"enabled": _enabled, "stages": stages, "histograms": histograms, "counters": counters}
+
+def to_json():
+    return json.dumps(snapshot(), ensure_ascii=False, indent=1)
+
+def _labels(pairs):
+    if not pairs: return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in pairs) + "}"
+
+def to_prometheus():
+    snap = snapshot(); lines = []
+    if snap["stages"]:
+        lines += [f"# TYPE {PREFIX}_stage_seconds_total counter", f"# TYPE {PREFIX}_stage_calls_total counter"]
+        for name, s in snap["stages"].items():
+            lines.append(f'{PREFIX}_stage_seconds_total{{stage="{name}"}} {s["total_s"]:.6f}')
+            lines.append(f'{PREFIX}_stage_calls_total{{stage="{name}"}} {s["calls"]}')
+    for name, h in snap["histograms"].items():
+        metric = f"{PREFIX}_{name}"
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, count in h["buckets"].items():
+            cumulative += count
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+        lines += [f"{metric}_sum {h['sum_s']:.6f}", f"{metric}_count {h['count']}"]
+    for name in sorted({c["name"] for c in snap["counters"]}):
+        lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+        for c in snap["counters"]:
+            if c["name"] == name: lines.append(f"{PREFIX}_{name}_total{_labels(sorted(c['labels'].items()))} {c['value']}")
+    return "\n".join(lines) + "\n"
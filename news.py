@@ -0,0 +1,137 @@
+import json
+import collections
+import functools
+import concurrent.futures
+import fetcher
+import metrics
+from cache import TTLCache, content_key
+
+# -----------------------------------------------------------
+# 뉴스 AI 분석
+#   기사(URL 기준)와 모델 응답(프롬프트 내용 해시 기준)을 TTL 캐시에 보관하고,
+#   본문에 실제로 나온 종목명만 프롬프트에 넣는다 (Aho-Corasick 매칭).
+#   모델은 generate(prompt) -> str 만 있으면 되므로 오프라인에서는 StubClient 로 교체.
+# -----------------------------------------------------------
+ARTICLE_TTL = 60 * 60
+RESPONSE_TTL = 24 * 60 * 60
+CONTENT_LIMIT = 3000
+MODEL_NAME = 'gemini-flash-latest'
+
+articles = TTLCache(ARTICLE_TTL, max_entries=512)
+responses = TTLCache(RESPONSE_TTL, max_entries=512)
+
+class GeminiClient:
+    def __init__(self, api_key, model_name=MODEL_NAME):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt):
+        return self.model.generate_content(prompt).text
+
+class StubClient:
+    # 고정 응답(문자열) 또는 prompt -> 문자열 함수로 동작하는 테스트용 모델
+    def __init__(self, response='{"good": [], "bad": []}', name="stub"):
+        self.response = response; self.name = name; self.calls = 0
+
+    def generate(self, prompt):
+        self.calls += 1
+        return self.response(prompt) if callable(self.response) else self.response
+
+# -----------------------------------------------------------
+# 종목명 매칭 (Aho-Corasick)
+# -----------------------------------------------------------
+class NameMatcher:
+    def __init__(self, names):
+        self.goto = [{}]; self.fail = [0]; self.out = [[]]
+        for name in names:
+            if not name: continue
+            node = 0
+            for ch in name:
+                if ch not in self.goto[node]:
+                    self.goto.append({}); self.fail.append(0); self.out.append([])
+                    self.goto[node][ch] = len(self.goto) - 1
+                node = self.goto[node][ch]
+            self.out[node].append(name)
+        queue = collections.deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]: f = self.fail[f]
+                self.fail[child] = self.goto[f].get(ch, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def find(self, text):
+        # 본문에 등장한 종목명 (처음 나온 순서, 중복 없음)
+        found = {}; node = 0
+        for ch in text:
+            while node and ch not in self.goto[node]: node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            for name in self.out[node]: found.setdefault(name, None)
+        return list(found)
+
+@functools.lru_cache(maxsize=8)
+def matcher(names):
+    return NameMatcher(names)
+
+def candidates(title, content, names):
+    # 제목/본문에 나온 종목만 후보로. 하나도 없으면 (업종 뉴스 등) 전체 목록을 그대로 사용
+    found = matcher(tuple(names)).find(title + "\n" + content)
+    return found or list(names)
+
+# -----------------------------------------------------------
+# 기사 수집 / 분석
+# -----------------------------------------------------------
+def fetch_article(url):
+    # → (제목, 본문 앞부분). 성공한 결과만 캐시
+    key = content_key("article", url)
+    cached = articles.get(key)
+    metrics.incr("cache", cache="article", result="hit" if cached else "miss")
+    if cached: return cached
+    from bs4 import BeautifulSoup
+    response = fetcher.session().get(url, timeout=10)
+    if response.status_code != 200: raise RuntimeError(f"접속 실패 ({response.status_code})")
+    soup = BeautifulSoup(response.text, 'html.parser')
+    title = soup.find('title').get_text() if soup.find('title') else "제목 없음"
+    article = (title, soup.get_text()[:CONTENT_LIMIT])
+    articles.set(key, article)
+    return article
+
+def build_prompt(title, content, names):
+    stock_names = ", ".join(names)
+    return f"""
+        당신은 주식 트레이더입니다. 뉴스: '{title}'
+        본문: {content}
+        관심종목: {stock_names}
+        이 뉴스에 영향을 받을 관심종목 중 호재 Top 5, 악재 Top 5를 선정하고 확률(0~100%)을 예측하세요.
+        JSON 형식: {{ "good": [{{"stock": "종목", "reason": "이유", "probability": 80}}], "bad": [...] }}
+        """
+
+def parse_response(text):
+    return json.loads(text.replace("```json", "").replace("```", "").strip())
+
+def analyze_news(url, stock_list_df, client):
+    # → (제목, 호재 리스트, 악재 리스트). 실패하면 제목 자리에 "에러: ..."
+    try:
+        title, content = fetch_article(url)
+        prompt = build_prompt(title, content, candidates(title, content, stock_list_df['Name'].tolist()))
+        key = content_key("response", getattr(client, "name", ""), prompt)
+        js = responses.get(key)
+        metrics.incr("cache", cache="response", result="miss" if js is None else "hit")
+        if js is None:
+            js = parse_response(client.generate(prompt))
+            responses.set(key, js)  # JSON 으로 읽히는 응답만 캐시
+        return title, js.get('good', []), js.get('bad', [])
+    except Exception as e:
+        metrics.incr("swallowed_errors", where="news.analyze_news")
+        return f"에러: {str(e)}", [], []
+
+def analyze_many(urls, stock_list_df, client, max_workers=8):
+    # 여러 기사를 동시에 수집/분석 → 입력 순서대로 [(url, 제목, 호재, 악재)]
+    urls = list(dict.fromkeys(u.strip() for u in urls if u.strip()))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda u: analyze_news(u, stock_list_df, client), urls))
+    return [(u, *r) for u, r in zip(urls, results)]
@@ -0,0 +1,84 @@
+import collections
+import numpy as np
+import pandas as pd
+import price_store
+import strategies
+
+# -----------------------------------------------------------
+# 날짜 × 종목 패널
+#   저장소의 종목별 배열을 공통 날짜축에 맞춘 2-D float 배열(T, N)로 모으고,
+#   MA5/MA20/MA60/Vol_MA5 와 눌림목/돌파 조건(strategies)을 전 종목에 대해 한 번에 계산한다.
+#   거래가 없는 날(상장 전, 거래정지, 다른 종목만 있는 날짜)은 NaN 이고, 이동평균 · 등락률은 종목마다
+#   자기 유효한 봉만 모아 계산한다 (종목별 DataFrame 에 pandas rolling 을 쓴 것과 같은 값)
+# -----------------------------------------------------------
+Panel = collections.namedtuple("Panel", ["dates", "codes", "close", "volume"])
+Indicators = collections.namedtuple("Indicators", ["ma5", "ma20", "ma60", "vol_ma5", "change"])
+
+def build_panel(codes, start=None):
+    arrays = {}
+    for code in codes:
+        stored = price_store.read_arrays(code)
+        if stored is None or len(stored[0]) == 0: continue
+        dates, ohlcv = stored
+        i = 0 if start is None else int(np.searchsorted(dates, pd.Timestamp(start).as_unit("ns").value))
+        arrays[code] = (dates[i:], ohlcv[3, i:], ohlcv[4, i:])
+    codes = list(arrays)
+    axis = np.unique(np.concatenate([a[0] for a in arrays.values()])) if arrays else np.array([], dtype=np.int64)
+    close = np.full((len(axis), len(codes)), np.nan)
+    volume = np.full((len(axis), len(codes)), np.nan)
+    for j, code in enumerate(codes):
+        dates, c, v = arrays[code]
+        rows = np.searchsorted(axis, dates)
+        close[rows, j] = c; volume[rows, j] = v
+    return Panel(pd.DatetimeIndex(axis.view("datetime64[ns]"), name="Date"), codes, close, volume)
+
+def rolling_mean(x, window):
+    # 축 0 방향 이동평균. 앞쪽 window-1 행은 NaN
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = np.lib.stride_tricks.sliding_window_view(x, window, axis=0).mean(axis=-1)
+    return out
+
+def indicators(panel):
+    # 열마다 유효한 행을 위로 모아(시간순 유지) 계산한 뒤 원래 행 위치로 되돌린다. 빈 행은 NaN 으로 남음
+    order = np.argsort(np.isnan(panel.close), axis=0, kind="stable")
+    close = np.take_along_axis(panel.close, order, axis=0)
+    volume = np.take_along_axis(panel.volume, order, axis=0)
+    change = np.full(close.shape, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        change[1:] = close[1:] / close[:-1] - 1
+    def back(a):
+        out = np.empty_like(a); np.put_along_axis(out, order, a, axis=0)
+        return out
+    return Indicators(*(back(a) for a in (rolling_mean(close, 5), rolling_mean(close, 20), rolling_mean(close, 60), rolling_mean(volume, 5), change)))
+
+def tail(panel, rows):
+    return Panel(panel.dates[-rows:], panel.codes, panel.close[-rows:], panel.volume[-rows:])
+
+def latest(panel):
+    # 종목별 자기 마지막 봉의 (종가, 거래량, Indicators). 공통 축의 마지막 행만 보면 하루라도 늦게 갱신된
+    # 종목이 NaN 이 되어 빠지므로, 종목마다 마지막 유효 행을 찾고 유효한 봉 61개가 들어오는 행까지만 계산한다
+    T = len(panel.dates)
+    seen = np.cumsum(~np.isnan(panel.close[::-1]), axis=0)  # 끝에서부터 센 유효 봉 수
+    last = T - 1 - np.argmax(seen > 0, axis=0)
+    enough = seen[-1] >= 61 if T else np.zeros(len(panel.codes), dtype=bool)
+    rows = T if (~enough).any() or not len(last) else int(np.argmax(seen >= 61, axis=0).max()) + 1
+    recent = tail(panel, rows)
+    at, cols = last - (T - rows), np.arange(len(panel.codes))
+    return recent.close[at, cols], recent.volume[at, cols], Indicators(*(a[at, cols] for a in indicators(recent)))
+
+def latest_frame(panel, today=None):
+    # 종목별 마지막 봉의 지표 DataFrame (스냅샷 저장용)
+    close, volume, ind = today or latest(panel)
+    return pd.DataFrame({"Close": close, "Volume": volume, "MA5": ind.ma5, "MA20": ind.ma20, "MA60": ind.ma60,
+                         "Vol_MA5": ind.vol_ma5, "Change": ind.change}, index=pd.Index(panel.codes, name="Code"))
+
+def scan(panel, today=None):
+    # 종목별 마지막 봉 기준 신호 → [(type, 코드, 종가, MA20)]. today 는 latest() 결과 (있으면 재사용)
+    if len(panel.dates) == 0: return []
+    close, volume, ind = today or latest(panel)
+    cols = (close, volume, ind.ma20, ind.ma60, ind.vol_ma5, ind.change)
+    sniper = strategies.sniper(*cols)
+    breaker = strategies.breaker(*cols) & ~sniper
+    hits = [("Sniper", j) for j in np.flatnonzero(sniper)] + [("Breaker", j) for j in np.flatnonzero(breaker)]
+    return [(kind, panel.codes[j], close[j], ind.ma20[j]) for kind, j in hits]
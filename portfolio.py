@@ -0,0 +1,109 @@
+import sys
+import argparse
+import datetime
+import collections
+import numpy as np
+import pandas as pd
+import panel
+import strategies
+import universe
+import scanner
+
+# -----------------------------------------------------------
+# 포트폴리오 백테스트 (공유 자본 · 보유 종목 수 제한)
+#   스캐너 신호를 전 종목 공통 날짜축 위에서 재생한다. 포지션 상태는 종목 축의
+#   정수 배열(보유 주수, 진입가)이라 날짜마다 벡터 연산 몇 번이면 된다.
+#   규칙은 단일 종목 백테스트와 같다: 종가 진입, +익절/-손절 종가 청산, 청산한 날은 재진입 안 함.
+#   같은 날 신호가 슬롯보다 많으면 유니버스 순서(시가총액 순)대로 채운다.
+# -----------------------------------------------------------
+CAPITAL = 10000000
+MAX_POSITIONS = 10
+
+Result = collections.namedtuple("Result", ["equity", "trades", "stats"])
+
+def signals(market, strategy_types=strategies.STRATEGIES, p=strategies.DEFAULT):
+    ind = panel.indicators(market)
+    cols = (market.close, market.volume, ind.ma20, ind.ma60, ind.vol_ma5, ind.change)
+    mask = np.zeros(market.close.shape, dtype=bool)
+    for kind in strategy_types: mask |= strategies.entry_mask(kind, *cols, p)
+    return mask
+
+def simulate(market, signal, capital=CAPITAL, max_positions=MAX_POSITIONS, p=strategies.DEFAULT, start=60):
+    T, N = market.close.shape
+    valid = ~np.isnan(market.close)
+    prices = np.where(valid, np.trunc(np.nan_to_num(market.close)), 0).astype(np.int64)
+    shares = np.zeros(N, dtype=np.int64); entry = np.zeros(N, dtype=np.int64)
+    last = np.zeros(N, dtype=np.int64)  # 거래정지 등으로 값이 빈 날의 평가용 직전 가격
+    cash = capital
+    equity = np.full(T, float(capital))
+    trades = []  # (날짜 위치, 종목 위치, 구분, 가격, 주수, 수익률%)
+    for t in range(T):
+        price = prices[t]; ok = valid[t]
+        last = np.where(ok, price, last)
+        if t >= start:
+            held = (shares > 0) & ok
+            with np.errstate(invalid='ignore', divide='ignore'):
+                profit = np.where(held, (price - entry) / np.maximum(entry, 1), 0.0)
+            exits = np.flatnonzero(held & ((profit >= p.take_profit) | (profit <= p.stop_loss)))
+            if len(exits):
+                cash += int((shares[exits] * price[exits]).sum())
+                trades.extend((t, j, "SELL", int(price[j]), int(shares[j]), float(profit[j]) * 100) for j in exits)
+                shares[exits] = 0
+            slots = max_positions - int(np.count_nonzero(shares))
+            if slots > 0:
+                candidates = signal[t] & ok & (shares == 0) & (price > 0)
+                candidates[exits] = False
+                if candidates.any():
+                    budget = (cash + int((shares * last).sum())) // max_positions
+                    # 1주도 못 사는 종목이 슬롯을 차지하지 않도록 살 수 있는 것만 남긴 뒤 순서대로 채운다
+                    for j in np.flatnonzero(candidates & (price <= min(budget, cash))):
+                        n = min(budget, cash) // int(price[j])
+                        if n == 0: continue  # 앞에서 산 만큼 현금이 줄어든 경우
+                        cash -= n * int(price[j]); shares[j] = n; entry[j] = price[j]
+                        trades.append((t, j, "BUY", int(price[j]), int(n), None))
+                        slots -= 1
+                        if slots == 0: break
+        equity[t] = cash + float((shares * last).sum())
+    return equity, trades
+
+def run(codes, years=3, capital=CAPITAL, max_positions=MAX_POSITIONS, strategy_types=strategies.STRATEGIES, p=strategies.DEFAULT):
+    start = datetime.datetime.now() - datetime.timedelta(days=int(years * 365) + 120)  # MA60 워밍업 여유
+    market = panel.build_panel(codes, start)
+    if len(market.dates) == 0: return None
+    equity, raw = simulate(market, signals(market, strategy_types, p), capital, max_positions, p)
+    equity = pd.Series(equity, index=market.dates, name="평가금액")
+    trades = pd.DataFrame([{"날짜": market.dates[t], "코드": market.codes[j], "구분": side, "가격": price, "수량": n, "수익률": r}
+                           for t, j, side, price, n, r in raw], columns=["날짜", "코드", "구분", "가격", "수량", "수익률"])
+    sells = trades[trades["구분"] == "SELL"]
+    drawdown = equity / equity.cummax() - 1
+    stats = {"총수익률": float(equity.iloc[-1] / capital - 1) * 100, "최대낙폭": float(drawdown.min()) * 100,
+             "매수": int((trades["구분"] == "BUY").sum()), "청산": len(sells),
+             "승률": float((sells["수익률"] > 0).mean() * 100) if len(sells) else 0.0, "종목수": len(market.codes)}
+    return Result(equity, trades, stats)
+
+def prepare(codes, years=3):
+    # 오늘치 갱신 + 필요한 과거 구간 보충 → 사용 가능한 종목 코드
+    status = scanner.refresh_store(codes)
+    ok = [c for c in codes if status[c].status == "ok"]
+    start = datetime.date.today() - datetime.timedelta(days=int(years * 365) + 120)
+    filled = scanner.backfill_store(ok, start)
+    return [c for c in ok if filled[c].status == "ok"]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="스캐너 신호를 공유 자본 포트폴리오로 백테스트합니다.")
+    parser.add_argument("--all", action="store_true", help="KOSPI/KOSDAQ 전 종목 (기본: 시총 상위 200)")
+    parser.add_argument("--years", type=float, default=3)
+    parser.add_argument("--capital", type=int, default=CAPITAL)
+    parser.add_argument("--max-positions", type=int, default=MAX_POSITIONS)
+    parser.add_argument("--strategy", choices=strategies.STRATEGIES, default=None, help="한 전략만 (기본: 둘 다)")
+    args = parser.parse_args(argv)
+
+    codes = prepare(universe.get_stock_list(None if args.all else universe.TOP_N)['Code'].tolist(), args.years)
+    result = run(codes, args.years, args.capital, args.max_positions, (args.strategy,) if args.strategy else strategies.STRATEGIES)
+    if result is None:
+        print("데이터 없음"); return 1
+    for k, v in result.stats.items(): print(f"{k}: {v:.2f}" if isinstance(v, float) else f"{k}: {v}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import os
+import datetime
+import threading
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------
+# 로컬 시세 저장소 (종목별 memory-mapped NumPy)
+#   data/prices/<코드>.dates.npy : int64 (datetime64[ns] 값)
+#   data/prices/<코드>.ohlcv.npy : float64 (5, N) — 컬럼별로 연속 메모리
+# 마지막 저장일부터 다시 받아 이어 붙이고(장중에 저장된 마지막 봉은 확정 종가로 덮어씀),
+# 직전 장 마감 이후에 이미 갱신한 종목은 네트워크를 타지 않는다.
+# -----------------------------------------------------------
+STORE_DIR = os.environ.get("SWING_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "prices"))
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+HISTORY_DAYS = 800  # 최초 다운로드 깊이 (보유 기간 분석 2년 + 스캔의 작년 1월 1일부터를 모두 덮음)
+KST = datetime.timezone(datetime.timedelta(hours=9))
+MARKET_CLOSE = datetime.time(15, 30)  # KRX 정규장 종료 (이 시각 이후 받은 봉만 확정 종가로 본다)
+
+_reader = None
+_locks = {}
+_locks_guard = threading.Lock()
+
+def set_reader(reader):
+    # fdr.DataReader(code, start, end=None) 와 같은 시그니처의 함수로 교체 (테스트/벤치마크용). None 이면 기본값 복원
+    global _reader
+    _reader = reader
+
+def _read(code, start, end=None):
+    if _reader is not None: return _reader(code, start, end)
+    import FinanceDataReader as fdr
+    return fdr.DataReader(code, start, end)
+
+def _lock(code):
+    with _locks_guard:
+        return _locks.setdefault(code, threading.Lock())
+
+def _paths(code):
+    base = os.path.join(STORE_DIR, code)
+    return base + ".dates.npy", base + ".ohlcv.npy"
+
+def _save(path, arr):
+    tmp = path + ".tmp.npy"
+    np.save(tmp, arr)
+    os.replace(tmp, path)
+
+def read_arrays(code):
+    # (dates, ohlcv) 를 읽기 전용 memmap 으로 반환 (복사 없음). 저장된 게 없으면 None
+    d_path, v_path = _paths(code)
+    if not (os.path.exists(d_path) and os.path.exists(v_path)): return None
+    dates = np.load(d_path, mmap_mode="r")
+    ohlcv = np.load(v_path, mmap_mode="r")
+    if len(dates) != ohlcv.shape[1]: return None  # 쓰는 도중 읽힌 경우
+    return dates, ohlcv
+
+def last_close(now=None):
+    # now 기준 가장 최근의 장 마감 시각 (주말은 건너뜀, 휴장일은 한 번 더 받는 것으로 충분)
+    now = now or datetime.datetime.now(KST)
+    close = datetime.datetime.combine(now.astimezone(KST).date(), MARKET_CLOSE, tzinfo=KST)
+    if now < close: close -= datetime.timedelta(days=1)
+    while close.weekday() >= 5: close -= datetime.timedelta(days=1)
+    return close
+
+def is_fresh(code, now=None):
+    # dates 파일의 mtime = 마지막 수집 시각. 직전 장 마감 이후에 받았어야 신선 (장중 수집은 다음 호출 때 다시 받음)
+    d_path, _ = _paths(code)
+    if not os.path.exists(d_path): return False
+    return os.path.getmtime(d_path) >= last_close(now).timestamp()
+
+def update(code, now=None):
+    # 마지막 저장일부터 받아 저장 (그 날의 봉은 새로 받은 값으로 교체). 신선하면 아무것도 하지 않음
+    now = now or datetime.datetime.now(KST)
+    with _lock(code):
+        if is_fresh(code, now): return False
+        stored = read_arrays(code)
+        if stored is None or len(stored[0]) == 0:
+            start = now.date() - datetime.timedelta(days=HISTORY_DAYS)
+        else:
+            start = pd.Timestamp(int(stored[0][-1])).date()
+        new = _read(code, start)
+        os.makedirs(STORE_DIR, exist_ok=True)
+        if new is not None and len(new) > 0:
+            new = new[~new.index.duplicated(keep="last")].sort_index()
+            new_dates = pd.DatetimeIndex(new.index).as_unit("ns").asi8
+            new_vals = new[COLUMNS].to_numpy(dtype=np.float64).T
+            if stored is not None:
+                keep = np.asarray(stored[0]) < new_dates[0]
+                new_dates = np.concatenate([np.asarray(stored[0])[keep], new_dates])
+                new_vals = np.concatenate([np.asarray(stored[1])[:, keep], new_vals], axis=1)
+            d_path, v_path = _paths(code)
+            _save(v_path, np.ascontiguousarray(new_vals))
+            _save(d_path, new_dates)  # dates 를 마지막에 써서 mtime 이 갱신 완료를 뜻하게 함
+        elif stored is not None:
+            # 정상 응답이면 마지막 저장일 봉이 반드시 들어 있다 → 빈 응답은 수집 실패. mtime 은 그대로 두고
+            # 예외로 올려 fetcher 가 재시도 · 분류하게 한다
+            raise RuntimeError(f"{code}: 빈 응답 ({start} 이후)")
+        else:
+            return False
+        return True
+
+def _since_path(code):
+    return os.path.join(STORE_DIR, code + ".since")
+
+def needs_backfill(code, start):
+    stored = read_arrays(code)
+    if stored is None or len(stored[0]) == 0: return False
+    since = pd.Timestamp(int(stored[0][0]))
+    if os.path.exists(_since_path(code)):
+        with open(_since_path(code)) as f: since = min(since, pd.Timestamp(f.read().strip()))
+    return pd.Timestamp(start).normalize() < since
+
+def backfill(code, start):
+    # 저장된 첫 봉보다 과거(start 부터)가 필요할 때 그 구간만 받아 앞에 붙인다.
+    # 구간 끝은 저장된 첫 봉 날짜 — 정상 응답이면 그 봉이 반드시 들어 있으므로, 빈 응답은 수집 실패로 보고
+    # 예외를 올린다 (fetcher 가 재시도 · 집계). 성공했을 때만 요청한 가장 이른 날짜를 <코드>.since 에 남겨
+    # 신규 상장 종목을 매번 다시 받지 않게 하고, dates 파일의 mtime(마지막 갱신 시각)은 그대로 둔다
+    start = pd.Timestamp(start).normalize()
+    with _lock(code):
+        if not needs_backfill(code, start): return False
+        stored = read_arrays(code)
+        first = int(stored[0][0])
+        new = _read(code, start.date(), pd.Timestamp(first).date())
+        if new is None or len(new) == 0: raise RuntimeError(f"{code}: 빈 응답 ({start.date()} 부터)")
+        new = new[~new.index.duplicated(keep="last")].sort_index()
+        new_dates = pd.DatetimeIndex(new.index).as_unit("ns").asi8
+        keep = new_dates < first
+        if keep.any():
+            d_path, v_path = _paths(code)
+            mtime = os.path.getmtime(d_path)
+            _save(v_path, np.ascontiguousarray(np.concatenate([new[COLUMNS].to_numpy(dtype=np.float64).T[:, keep], np.asarray(stored[1])], axis=1)))
+            _save(d_path, np.concatenate([new_dates[keep], np.asarray(stored[0])]))
+            os.utime(d_path, (mtime, mtime))
+        with open(_since_path(code), "w") as f: f.write(start.date().isoformat())
+        return True
+
+def load(code, start=None, refresh=True):
+    # 저장소에서 DataFrame 을 만든다. 값은 memmap 을 그대로 참조 (copy=False)
+    if refresh: update(code)
+    stored = read_arrays(code)
+    if stored is None: return pd.DataFrame(columns=COLUMNS, dtype=np.float64)
+    dates, ohlcv = stored
+    i = 0
+    if start is not None:
+        i = int(np.searchsorted(dates, pd.Timestamp(start).as_unit("ns").value))
+    index = pd.DatetimeIndex(np.asarray(dates[i:]).view("datetime64[ns]"), name="Date")
+    return pd.DataFrame(ohlcv[:, i:].T, index=index, columns=COLUMNS, copy=False)
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import glob
+import argparse
+import collections
+import datetime
+import numpy as np
+import pandas as pd
+import price_store
+import backtest
+import universe
+import fetcher
+import panel
+import strategies
+import metrics
+
+# -----------------------------------------------------------
+# 시장 스캔 엔진 (Streamlit 없이 실행 가능)
+#   python scanner.py [--backtest]  →  data/snapshots/scan_YYYYMMDD_HHMMSS.json
+#   대시보드는 가장 최신 스냅샷을 읽기만 한다.
+# -----------------------------------------------------------
+SNAPSHOT_DIR = os.environ.get("SWING_SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "snapshots"))
+SNAPSHOT_VERSION = 1
+SNAPSHOT_KEEP = 30
+
+ScanResult = collections.namedtuple("ScanResult", ["sniper", "breaker", "status", "indicators"])
+Snapshot = collections.namedtuple("Snapshot", ["sniper", "breaker", "created", "status", "indicators"])
+
+def scan_start():
+    return datetime.date(datetime.date.today().year - 1, 1, 1)
+
+def signal_row(kind, name, code, close, ma20):
+    current_price, stop_price, target_price = strategies.levels(kind, close, ma20)
+    return {"type": kind, "종목명": name, "코드": code, "현재가": f"{current_price:,}원", "🔵손절가": f"{stop_price:,}원", "🔴목표가": f"{target_price:,}원", "전략": strategies.LABELS[kind]}
+
+def _refresh(code):
+    # 네트워크 단계: 저장소 갱신만 하고, 저장된 봉이 하나도 없으면 empty 로 집계되도록 None
+    price_store.update(code)
+    stored = price_store.read_arrays(code)
+    return stored[0] if stored is not None else None
+
+def refresh_store(codes):
+    # 직전 장 마감 이후 아직 갱신하지 않은 종목만 네트워크로 받는다 → {코드: FetchResult}
+    stale = [code for code in codes if not price_store.is_fresh(code)]
+    status = fetcher.fetch_many(stale, _refresh)
+    for code in codes:
+        if code not in status: status[code] = fetcher.FetchResult(code, "ok", None, None, 0, 0.0)
+    return status
+
+def backfill_store(codes, start):
+    # start 이전 구간이 비어 있는 종목만 네트워크로 앞쪽을 채운다 → {코드: FetchResult}
+    need = [code for code in codes if price_store.needs_backfill(code, start)]
+    status = fetcher.fetch_many(need, lambda code: price_store.backfill(code, start) or True)
+    for code in codes:
+        if code not in status: status[code] = fetcher.FetchResult(code, "ok", None, None, 0, 0.0)
+    return status
+
+def scan_market(stock_list):
+    # → ScanResult(눌림목 df, 돌파 df, {코드: FetchResult}, 종목별 최신 지표 df).
+    #   이미 신선한 종목은 수집 단계를 건너뛰고, 신호는 날짜 × 종목 패널로 전 종목을 한 번에 계산한다
+    names = dict(zip(stock_list['Code'], stock_list['Name']))
+    with metrics.stage("scan.fetch"): status = refresh_store(names)
+    ok = [code for code in names if status[code].status == "ok"]
+    with metrics.stage("scan.panel"): market = panel.build_panel(ok, scan_start())
+    with metrics.stage("scan.signals"):
+        today = panel.latest(market) if len(market.dates) else None
+        hits = panel.scan(market, today)
+    with metrics.stage("scan.assemble"):
+        sniper_results, breaker_results = [], []
+        for kind, code, close, ma20 in hits:
+            (sniper_results if kind == "Sniper" else breaker_results).append(signal_row(kind, names[code], code, close, ma20))
+        sniper_df, breaker_df = pd.DataFrame(sniper_results), pd.DataFrame(breaker_results)
+        indicators = panel.latest_frame(market, today) if today else pd.DataFrame()
+        indicators.attrs["date"] = market.dates[-1].date().isoformat() if len(market.dates) else None
+    return ScanResult(sniper_df, breaker_df, status, indicators)
+
+def analyze_market_parallel(stock_list):
+    result = scan_market(stock_list)
+    return result.sniper, result.breaker
+
+def add_backtest_returns(df, strategy_type):
+    # 스캔 결과 전체를 한 번에 백테스트해 '1년수익률' 컬럼을 붙인다
+    if df.empty: return df
+    status = refresh_store(df['코드'].tolist())
+    results = backtest.run_batch([c for c in df['코드'] if status[c].status == "ok"], strategy_type)
+    df['1년수익률'] = [round(results[c][0], 1) if c in results else None for c in df['코드']]
+    return df
+
+# -----------------------------------------------------------
+# 스냅샷 저장/로드
+# -----------------------------------------------------------
+def save_snapshot(sniper_df, breaker_df, snapshot_dir=None, created=None, status=None, indicators=None):
+    # JSON(신호 표) + 같은 이름의 .npz(전 종목 최신 지표). JSON 을 마지막에 써서 짝이 항상 완성돼 있게 함
+    snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+    created = created or datetime.datetime.now()
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = os.path.join(snapshot_dir, f"scan_{created:%Y%m%d_%H%M%S}.json")
+    payload = {"version": SNAPSHOT_VERSION, "created": created.isoformat(timespec="seconds"),
+               "sniper": sniper_df.to_dict("records"), "breaker": breaker_df.to_dict("records"),
+               "status": fetcher.summarize(status) if status else {}}
+    if indicators is not None and not indicators.empty:
+        npz_path = path[:-len(".json")] + ".npz"
+        with open(npz_path + ".tmp", "wb") as f:
+            np.savez(f, codes=indicators.index.to_numpy(dtype=str), columns=np.array(indicators.columns, dtype=str),
+                     values=indicators.to_numpy(dtype=np.float64))
+        os.replace(npz_path + ".tmp", npz_path)
+        payload["indicators"] = {"file": os.path.basename(npz_path), "date": indicators.attrs.get("date")}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f: json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp, path)
+    for old in list_snapshots(snapshot_dir)[:-SNAPSHOT_KEEP]:
+        os.remove(old)
+        if os.path.exists(old[:-len(".json")] + ".npz"): os.remove(old[:-len(".json")] + ".npz")
+    return path
+
+def list_snapshots(snapshot_dir=None):
+    # 파일명이 생성 시각이라 이름순 정렬 = 시간순
+    return sorted(glob.glob(os.path.join(snapshot_dir or SNAPSHOT_DIR, "scan_*.json")))
+
+def latest_snapshot_path(snapshot_dir=None):
+    paths = list_snapshots(snapshot_dir)
+    return paths[-1] if paths else None
+
+def load_snapshot(path):
+    # → Snapshot. 버전이 다르면 None
+    with open(path, encoding="utf-8") as f: payload = json.load(f)
+    if payload.get("version") != SNAPSHOT_VERSION: return None
+    indicators = pd.DataFrame()
+    meta = payload.get("indicators")
+    if meta and os.path.exists(os.path.join(os.path.dirname(path), meta["file"])):
+        with np.load(os.path.join(os.path.dirname(path), meta["file"])) as npz:
+            indicators = pd.DataFrame(npz["values"], index=pd.Index(npz["codes"], name="Code"), columns=npz["columns"])
+        indicators.attrs["date"] = meta.get("date")
+    return Snapshot(pd.DataFrame(payload["sniper"]), pd.DataFrame(payload["breaker"]), payload["created"], payload.get("status", {}), indicators)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="시장 스캔을 실행하고 스냅샷을 저장합니다.")
+    parser.add_argument("--backtest", action="store_true", help="신호 종목의 1년 백테스트 수익률 포함")
+    parser.add_argument("--all", action="store_true", help="KOSPI/KOSDAQ 전 종목 스캔 (기본: 시총 상위 200)")
+    parser.add_argument("--out", default=None, help=f"스냅샷 폴더 (기본: {SNAPSHOT_DIR})")
+    args = parser.parse_args(argv)
+
+    df_s, df_b, status, indicators = scan_market(universe.get_stock_list(None if args.all else universe.TOP_N))
+    if args.backtest:
+        df_s = add_backtest_returns(df_s, "Sniper")
+        df_b = add_backtest_returns(df_b, "Breaker")
+    path = save_snapshot(df_s, df_b, args.out, status=status, indicators=indicators)
+    print(f"눌림목 {len(df_s)}개 / 돌파 {len(df_b)}개 → {path}")
+    print("수집 상태:", fetcher.summarize(status))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,17 @@
 import streamlit as st
-import FinanceDataReader as fdr
-import pandas as pd
+import streamlit.components.v1 as components
+import os
 import datetime
-import concurrent.futures
-import plotly.graph_objects as go
-import requests
-from bs4 import BeautifulSoup
-import google.generativeai as genai
-import json
-import numpy as np
+import pandas as pd
+import price_store
+import universe
+import scanner
+import fetcher
+import metrics
+import strategies
+import portfolio
+# charts(plotly) · news(genai/bs4) · holding · streaming 은 해당 기능을 쓸 때 import 한다.
+# 첫 화면은 디스크의 최신 스캔 스냅샷만으로 그려서 콜드 스타트에 네트워크/무거운 import 가 없다.
 
 # -----------------------------------------------------------
 # [1] 기본 설정 (레이아웃 및 다크모드 강제 CSS)
@@ -43,217 +46,31 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # -----------------------------------------------------------
-# [2] 데이터 수집 엔진 (TOP 200)
+# [2] 데이터 수집 엔진 (KRX 상장 목록)
 # -----------------------------------------------------------
-@st.cache_data
-def get_stock_list():
-    # KOSPI + KOSDAQ 시가총액 상위 200개 종목 데이터
-    data = [
-        {'Code': '005930', 'Name': '삼성전자'}, {'Code': '000660', 'Name': 'SK하이닉스'},
-        {'Code': '042700', 'Name': '한미반도체'}, {'Code': '000100', 'Name': '유한양행'},
-        {'Code': '018260', 'Name': '삼성에스디에스'}, {'Code': '009150', 'Name': '삼성전기'},
-        {'Code': '011070', 'Name': 'LG이노텍'}, {'Code': '403870', 'Name': 'HPSP'},
-        {'Code': '005935', 'Name': '삼성전자우'}, {'Code': '022100', 'Name': '포스코DX'},
-        {'Code': '000990', 'Name': 'DB하이텍'}, {'Code': '052690', 'Name': '한전기술'},
-        {'Code': '036830', 'Name': '솔브레인'}, {'Code': '240810', 'Name': '원익IPS'},
-        {'Code': '039030', 'Name': '이오테크닉스'}, {'Code': '322000', 'Name': 'HD현대에너지솔루션'},
-        {'Code': '068240', 'Name': '다원시스'}, {'Code': '131970', 'Name': '테크윙'},
-        {'Code': '095610', 'Name': '테스'}, {'Code': '051915', 'Name': 'LG화학우'},
-        {'Code': '009155', 'Name': '삼성전기우'}, {'Code': '036930', 'Name': '주성엔지니어링'},
-        {'Code': '330860', 'Name': '네패스아크'}, {'Code': '033640', 'Name': '네패스'},
-        {'Code': '066570', 'Name': 'LG전자'}, {'Code': '034220', 'Name': 'LG디스플레이'},
-        {'Code': '003380', 'Name': '하림지주'}, {'Code': '088800', 'Name': '에이스테크'},
-        {'Code': '373220', 'Name': 'LG에너지솔루션'}, {'Code': '006400', 'Name': '삼성SDI'},
-        {'Code': '051910', 'Name': 'LG화학'}, {'Code': '005490', 'Name': 'POSCO홀딩스'},
-        {'Code': '247540', 'Name': '에코프로비엠'}, {'Code': '086520', 'Name': '에코프로'},
-        {'Code': '003670', 'Name': '포스코퓨처엠'}, {'Code': '066970', 'Name': '엘앤에프'},
-        {'Code': '096770', 'Name': 'SK이노베이션'}, {'Code': '051900', 'Name': 'LG생활건강'},
-        {'Code': '090430', 'Name': '아모레퍼시픽'}, {'Code': '010950', 'Name': 'S-Oil'},
-        {'Code': '011170', 'Name': '롯데케미칼'}, {'Code': '011780', 'Name': '금호석유'},
-        {'Code': '009830', 'Name': '한화솔루션'}, {'Code': '112610', 'Name': '씨에스윈드'},
-        {'Code': '010130', 'Name': '고려아연'}, {'Code': '034020', 'Name': '두산에너빌리티'},
-        {'Code': '015760', 'Name': '한국전력'}, {'Code': '036460', 'Name': '한국가스공사'},
-        {'Code': '348370', 'Name': '엔켐'}, {'Code': '005950', 'Name': '이수화학'},
-        {'Code': '011790', 'Name': 'SKC'}, {'Code': '014830', 'Name': '유니드'},
-        {'Code': '003240', 'Name': '태광산업'}, {'Code': '010060', 'Name': 'OCI'},
-        {'Code': '004800', 'Name': '효성'}, {'Code': '001740', 'Name': 'SK네트웍스'},
-        {'Code': '016360', 'Name': '삼성증권'}, {'Code': '271560', 'Name': '오리온'},
-        {'Code': '005380', 'Name': '현대차'}, {'Code': '000270', 'Name': '기아'},
-        {'Code': '012330', 'Name': '현대모비스'}, {'Code': '086280', 'Name': '현대글로비스'},
-        {'Code': '003490', 'Name': '대한항공'}, {'Code': '011200', 'Name': 'HMM'},
-        {'Code': '000120', 'Name': 'CJ대한통운'}, {'Code': '042660', 'Name': '한화오션'},
-        {'Code': '009540', 'Name': 'HD한국조선해양'}, {'Code': '010140', 'Name': '삼성중공업'},
-        {'Code': '010620', 'Name': '현대미포조선'}, {'Code': '028670', 'Name': '팬오션'},
-        {'Code': '000720', 'Name': '현대건설'}, {'Code': '006360', 'Name': 'GS건설'},
-        {'Code': '047050', 'Name': '포스코인터내셔널'}, {'Code': '012450', 'Name': '한화에어로스페이스'},
-        {'Code': '064350', 'Name': '현대로템'}, {'Code': '079550', 'Name': 'LIG넥스원'},
-        {'Code': '011210', 'Name': '현대위아'}, {'Code': '004020', 'Name': '현대제철'},
-        {'Code': '277810', 'Name': '레인보우로보틱스'}, {'Code': '462510', 'Name': '두산로보틱스'},
-        {'Code': '375500', 'Name': 'DL이앤씨'}, {'Code': '000210', 'Name': 'DL'},
-        {'Code': '001040', 'Name': 'CJ'}, {'Code': '010100', 'Name': '한국무브넥스'},
-        {'Code': '207940', 'Name': '삼성바이오로직스'}, {'Code': '068270', 'Name': '셀트리온'},
-        {'Code': '028300', 'Name': 'HLB'}, {'Code': '196170', 'Name': '알테오젠'},
-        {'Code': '128940', 'Name': '한미약품'}, {'Code': '328130', 'Name': '루닛'},
-        {'Code': '237690', 'Name': '에스티팜'}, {'Code': '214150', 'Name': '클래시스'},
-        {'Code': '145020', 'Name': '휴젤'}, {'Code': '069620', 'Name': '대웅제약'},
-        {'Code': '019170', 'Name': '신풍제약'}, {'Code': '091990', 'Name': '셀트리온제약'},
-        {'Code': '006280', 'Name': '녹십자'}, {'Code': '185750', 'Name': '종근당'},
-        {'Code': '009290', 'Name': '광동제약'}, {'Code': '009420', 'Name': '한올바이오파마'},
-        {'Code': '235980', 'Name': '메드팩토'}, {'Code': '067630', 'Name': '에이치엘비생명과학'},
-        {'Code': '003000', 'Name': '부광약품'}, {'Code': '056190', 'Name': '아미코젠'},
-        {'Code': '035420', 'Name': 'NAVER'}, {'Code': '035720', 'Name': '카카오'},
-        {'Code': '293490', 'Name': '카카오게임즈'}, {'Code': '263750', 'Name': '펄어비스'},
-        {'Code': '036570', 'Name': '엔씨소프트'}, {'Code': '251270', 'Name': '넷마블'},
-        {'Code': '035900', 'Name': 'JYP Ent.'}, {'Code': '041510', 'Name': '에스엠'},
-        {'Code': '122870', 'Name': '와이지엔터테인먼트'}, {'Code': '352820', 'Name': '하이브'},
-        {'Code': '017670', 'Name': 'SK텔레콤'}, {'Code': '030200', 'Name': 'KT'},
-        {'Code': '032640', 'Name': 'LG유플러스'}, {'Code': '079160', 'Name': 'CJ CGV'},
-        {'Code': '053800', 'Name': '안랩'}, {'Code': '089600', 'Name': '나스미디어'},
-        {'Code': '032620', 'Name': '유비쿼스'}, {'Code': '090350', 'Name': '노랑풍선'},
-        {'Code': '105560', 'Name': 'KB금융'}, {'Code': '055550', 'Name': '신한지주'},
-        {'Code': '086790', 'Name': '하나금융지주'}, {'Code': '316140', 'Name': '우리금융지주'},
-        {'Code': '003550', 'Name': 'LG'}, {'Code': '000810', 'Name': '삼성화재'},
-        {'Code': '032830', 'Name': '삼성생명'}, {'Code': '024110', 'Name': '기업은행'},
-        {'Code': '029780', 'Name': '삼성카드'}, {'Code': '071050', 'Name': '한국금융지주'},
-        {'Code': '039490', 'Name': '키움증권'}, {'Code': '006800', 'Name': '미래에셋증권'},
-        {'Code': '005830', 'Name': 'DB손해보험'}, {'Code': '001450', 'Name': '현대해상'},
-        {'Code': '175330', 'Name': 'JB금융지주'}, {'Code': '000070', 'Name': '삼양홀딩스'},
-        {'Code': '021240', 'Name': '코웨이'}, {'Code': '008770', 'Name': '호텔신라'},
-        {'Code': '028260', 'Name': '삼성물산'}, {'Code': '002790', 'Name': '아모레G'},
-        {'Code': '033780', 'Name': 'KT&G'}, {'Code': '026960', 'Name': '동서'},
-        {'Code': '078930', 'Name': 'GS'}, {'Code': '000080', 'Name': '하이트진로'},
-        {'Code': '004990', 'Name': '롯데지주'}, {'Code': '007070', 'Name': 'GS리테일'},
-        {'Code': '023530', 'Name': '롯데쇼핑'}, {'Code': '139480', 'Name': '이마트'},
-        {'Code': '282330', 'Name': 'BGF리테일'}, {'Code': '069960', 'Name': '현대백화점'},
-        {'Code': '031430', 'Name': '신세계인터내셔날'}, {'Code': '020000', 'Name': '한섬'},
-        {'Code': '093050', 'Name': 'LF'}, {'Code': '009970', 'Name': '영원무역홀딩스'},
-        {'Code': '111770', 'Name': '영원무역'}, {'Code': '004370', 'Name': '농심'},
-        {'Code': '097950', 'Name': 'CJ제일제당'}, {'Code': '007310', 'Name': '오뚜기'},
-        {'Code': '280360', 'Name': '롯데웰푸드'}, {'Code': '005610', 'Name': 'SPC삼립'},
-        {'Code': '003230', 'Name': '삼양식품'}, {'Code': '036580', 'Name': '팜스코'},
-        {'Code': '001440', 'Name': '대한전선'}, {'Code': '010120', 'Name': 'LSELECTRIC'},
-        {'Code': '402340', 'Name': 'SK스퀘어'}, {'Code': '034730', 'Name': 'SK'},
-        {'Code': '012630', 'Name': 'HDC'}, {'Code': '000150', 'Name': '두산'},
-        {'Code': '005385', 'Name': '현대차우'}, {'Code': '004170', 'Name': '신세계'},
-        {'Code': '001680', 'Name': '대상'}, {'Code': '005180', 'Name': '빙그레'},
-        {'Code': '298020', 'Name': '효성티앤씨'}, {'Code': '298050', 'Name': '효성첨단소재'},
-        {'Code': '298000', 'Name': '효성화학'}, {'Code': '009240', 'Name': '한샘'},
-        {'Code': '019680', 'Name': '대교'}, {'Code': '003850', 'Name': '보령'},
-        {'Code': '005250', 'Name': '녹십자홀딩스'}, {'Code': '014680', 'Name': '한솔케미칼'},
-        {'Code': '005090', 'Name': 'SGC에너지'}, {'Code': '036490', 'Name': '대덕전자'},
-        {'Code': '298040', 'Name': '효성중공업'}, {'Code': '006650', 'Name': '대한유화'},
-        {'Code': '003090', 'Name': '대웅'}, {'Code': '007570', 'Name': '일양약품'},
-        {'Code': '214390', 'Name': '경보제약'}, {'Code': '000995', 'Name': 'DB하이텍1우'},
-        {'Code': '081660', 'Name': '휠라홀딩스'}, {'Code': '010620', 'Name': '현대미포조선'},
-        {'Code': '002380', 'Name': 'KCC'}, {'Code': '009410', 'Name': '태영건설'},
-        {'Code': '004490', 'Name': '세방전지'}, {'Code': '032350', 'Name': '롯데관광개발'},
-        {'Code': '011930', 'Name': '신성이엔지'}, {'Code': '092220', 'Name': 'KEC'},
-        {'Code': '005850', 'Name': '에스엘'}, {'Code': '003520', 'Name': '영진약품'},
-        {'Code': '000240', 'Name': '한국타이어앤테크놀로지'}, {'Code': '016380', 'Name': 'KG동부제철'}
-    ]
-    return pd.DataFrame(data)
+@st.cache_data(ttl=3600)
+def get_stock_list(limit=universe.TOP_N):
+    return universe.get_stock_list(limit)
 
-def fetch_stock_data(code, name):
-    try:
-        df = fdr.DataReader(code, datetime.datetime.now().year - 1)
-        if len(df) < 60: return None
-        
-        df['MA5'] = df['Close'].rolling(window=5).mean()
-        df['MA20'] = df['Close'].rolling(window=20).mean()
-        df['MA60'] = df['Close'].rolling(window=60).mean()
-        df['Vol_MA5'] = df['Volume'].rolling(window=5).mean()
-        df['Change'] = df['Close'].pct_change()
-        
-        today = df.iloc[-1]
-        current_price = int(today['Close'])
-        result = None
-        
-        if (today['MA20'] > today['MA60']) and (abs(today['Close'] - today['MA20']) / today['MA20'] <= 0.03) and (today['Volume'] < today['Vol_MA5']):
-            ma20_price = int(today['MA20'])
-            stop_price = int(current_price * 0.97) if current_price < ma20_price else ma20_price
-            result = {"type": "Sniper", "종목명": name, "코드": code, "현재가": f"{current_price:,}원", "🔵손절가": f"{stop_price:,}원", "🔴목표가": f"{int(current_price * 1.05):,}원", "전략": "눌림목"}
-        elif (today['Volume'] > today['Vol_MA5'] * 1.5) and (today['Change'] > 0.02) and (today['Close'] > today['MA60']):
-            result = {"type": "Breaker", "종목명": name, "코드": code, "현재가": f"{current_price:,}원", "🔵손절가": f"{int(current_price * 0.97):,}원", "🔴목표가": f"{int(current_price * 1.05):,}원", "전략": "돌파"}
-        return result
-    except: return None
+@st.cache_data
+def load_snapshot(path):
+    # 경로별로 캐시되어 모든 세션이 같은 스냅샷을 공유
+    return scanner.load_snapshot(path)
 
-def analyze_market_parallel(stock_list):
-    sniper_results, breaker_results = [], []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
-        futures = {executor.submit(fetch_stock_data, row['Code'], row['Name']): row for i, row in stock_list.iterrows()}
-        for future in concurrent.futures.as_completed(futures):
-            res = future.result()
-            if res:
-                if res['type'] == 'Sniper': sniper_results.append(res)
-                elif res['type'] == 'Breaker': breaker_results.append(res)
-    return pd.DataFrame(sniper_results), pd.DataFrame(breaker_results)
+def market_overview(indicators):
+    # 스냅샷의 전 종목 최신 지표 → 시장 폭(breadth) 한 줄 요약
+    ind = indicators.dropna(subset=["MA20", "MA60"])
+    if ind.empty: return None
+    above20 = (ind["Close"] > ind["MA20"]).mean() * 100
+    above60 = (ind["Close"] > ind["MA60"]).mean() * 100
+    aligned = ((ind["MA5"] > ind["MA20"]) & (ind["MA20"] > ind["MA60"])).mean() * 100
+    return f"🌐 {indicators.attrs.get('date') or ''} {len(ind)}종목 · 20일선 위 {above20:.0f}% · 60일선 위 {above60:.0f}% · 정배열 {aligned:.0f}%"
 
-def run_backtest(code, name, strategy_type):
-    df = fdr.DataReader(code, datetime.datetime.now() - datetime.timedelta(days=365))
-    df['MA20'] = df['Close'].rolling(window=20).mean()
-    df['MA60'] = df['Close'].rolling(window=60).mean()
-    df['Vol_MA5'] = df['Volume'].rolling(window=5).mean()
-    balance = 1000000; shares = 0; trades = []
-    
-    for i in range(60, len(df)):
-        today = df.iloc[i]; date = df.index[i]; price = int(today['Close'])
-        buy_signal = False
-        if strategy_type == "Sniper":
-            if (today['MA20'] > today['MA60']) and (abs(today['Close'] - today['MA20']) / today['MA20'] <= 0.03) and (today['Volume'] < today['Vol_MA5']): buy_signal = True
-        elif strategy_type == "Breaker":
-            if (today['Volume'] > today['Vol_MA5'] * 1.5) and (today['Close'] > today['MA60']): buy_signal = True
-            
-        if shares == 0 and buy_signal:
-            shares = balance // price; balance -= shares * price; entry_price = price
-            trades.append({"date": date, "type": "BUY", "price": price})
-        elif shares > 0:
-            profit = (price - entry_price) / entry_price
-            if profit >= 0.05 or profit <= -0.03:
-                balance += shares * price; shares = 0
-                trades.append({"date": date, "type": "SELL", "price": price, "profit": profit * 100})
-    if shares > 0: balance += shares * df.iloc[-1]['Close']
-    return (balance - 1000000)/10000, trades, df
-
-def draw_chart_with_backtest(df, trades, name):
-    # [야간모드 패치] template='plotly_dark' 추가하여 차트 배경을 어둡게 설정
-    fig = go.Figure(data=[go.Candlestick(x=df.index, open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'], name='캔들')])
-    fig.add_trace(go.Scatter(x=df.index, y=df['MA20'], line=dict(color='#FFA500'), name='20일선')) # 오렌지색
-    
-    buy_x = [t['date'] for t in trades if t['type'] == 'BUY']; buy_y = [t['price'] for t in trades if t['type'] == 'BUY']
-    sell_x = [t['date'] for t in trades if t['type'] == 'SELL']; sell_y = [t['price'] for t in trades if t['type'] == 'SELL']
-    
-    fig.add_trace(go.Scatter(x=buy_x, y=buy_y, mode='markers', marker=dict(color='#FF6B6B', size=10, symbol='triangle-up'), name='매수')) # 연한 빨강
-    fig.add_trace(go.Scatter(x=sell_x, y=sell_y, mode='markers', marker=dict(color='#4DABF7', size=10, symbol='triangle-down'), name='매도')) # 연한 파랑
-    
-    fig.update_layout(height=400, title=f"{name} 1년 백테스팅", xaxis_rangeslider_visible=False, template='plotly_dark')
-    st.plotly_chart(fig, use_container_width=True)
-
-# -----------------------------------------------------------
-# [기능 2] 뉴스 AI 분석 함수
-# -----------------------------------------------------------
-def analyze_news_with_gemini(api_key, url, stock_list_df):
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0'}; response = requests.get(url, headers=headers, timeout=10)
-        if response.status_code != 200: return f"에러: 접속 실패 ({response.status_code})", [], []
-        soup = BeautifulSoup(response.text, 'html.parser')
-        title = soup.find('title').get_text() if soup.find('title') else "제목 없음"
-        content = soup.get_text()[:3000]
-        
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-flash-latest')
-        stock_names = ", ".join(stock_list_df['Name'].tolist())
-        
-        prompt = f"""
-        당신은 주식 트레이더입니다. 뉴스: '{title}'
-        본문: {content}
-        관심종목: {stock_names}
-        이 뉴스에 영향을 받을 관심종목 중 호재 Top 5, 악재 Top 5를 선정하고 확률(0~100%)을 예측하세요.
-        JSON 형식: {{ "good": [{{"stock": "종목", "reason": "이유", "probability": 80}}], "bad": [...] }}
-        """
-        res = model.generate_content(prompt)
-        js = json.loads(res.text.replace("```json", "").replace("```", "").strip())
-        return title, js.get('good', []), js.get('bad', [])
-    except Exception as e: return f"에러: {str(e)}", [], []
+def show_backtest(row, strategy_type, years):
+    import charts
+    view = charts.backtest_view(row['코드'], row['종목명'], strategy_type, years)
+    st.metric(f"{years}년 수익률", f"{view.ret:.1f}%")
+    with metrics.stage("chart.render"): components.html(view.html, height=charts.HEIGHT + 20)
 
 # -----------------------------------------------------------
 # [기능 3] 보유 기간 최적화 함수
@@ -264,34 +81,9 @@ def analyze_holding_period(stock_name):
     if found.empty: return None, None, None, "종목을 찾을 수 없습니다."
     code = found.iloc[0]['Code']
     
-    df = fdr.DataReader(code, datetime.datetime.now() - datetime.timedelta(days=730))
-    if len(df) < 200: return None, None, None, "데이터가 부족합니다."
-    
-    df['Change'] = df['Close'].pct_change().abs()
-    volatility = df['Change'].mean() * 100
-    df['MA60'] = df['Close'].rolling(60).mean()
-    trend_ratio = (df['Close'] > df['MA60']).sum() / len(df)
-    
-    char_type = "🚀 모멘텀형" if volatility > 2.5 else "🧱 누적형" if trend_ratio > 0.6 else "🎢 이벤트형"
-    
-    holding_days = [5, 10, 20, 40, 60, 90]
-    results = {}
-    df['Buy_Signal'] = (df['Close'] > df['Close'].rolling(20).mean()) & (df['Close'].shift(1) <= df['Close'].shift(1).rolling(20).mean())
-    buy_dates = df.index[df['Buy_Signal']]
-    
-    for days in holding_days:
-        profit_list = []
-        for buy_date in buy_dates:
-            try:
-                idx = df.index.get_loc(buy_date)
-                if idx + days < len(df):
-                    profit_list.append((df.iloc[idx + days]['Close'] - df.iloc[idx]['Close']) / df.iloc[idx]['Close'] * 100)
-            except: pass
-        if profit_list: results[f"{days//5}주"] = np.mean(profit_list)
-    
-    if not results: return None, None, None, "매매 기회 부족"
-    best_period = max(results, key=results.get)
-    return char_type, results, best_period, None
+    import holding
+    df = price_store.load(code, datetime.datetime.now() - datetime.timedelta(days=holding.LOOKBACK_DAYS))
+    return holding.analyze_frame(df)
 
 # -----------------------------------------------------------
 # [메인 UI] 탭 구성
@@ -304,15 +96,37 @@ except: api_key = st.sidebar.text_input("Gemini API Key", type="password")
 tab1, tab2, tab3 = st.tabs(["📊 차트/백테스트", "📰 뉴스 AI", "⏳ 언제까지 들고가?"])
 
 with tab1:
-    if st.button("🔄 시장 스캔 (Top 200)"):
-        stocks = get_stock_list()
+    full_market = st.checkbox("KOSPI/KOSDAQ 전 종목 스캔")
+    if st.button("🔄 시장 스캔 (전 종목)" if full_market else "🔄 시장 스캔 (Top 200)"):
+        stocks = get_stock_list(None if full_market else universe.TOP_N)
         st.toast("분석 중...")
-        df_s, df_b = analyze_market_parallel(stocks)
+        df_s, df_b, status, indicators = scanner.scan_market(stocks)
         st.session_state.sniper_df = df_s
         st.session_state.breaker_df = df_b
+        st.session_state.indicators = indicators
         st.session_state.scanned = True
-        
+        st.session_state.snapshot_path = scanner.save_snapshot(df_s, df_b, status=status, indicators=indicators)
+        st.session_state.snapshot_time = datetime.datetime.now().isoformat(timespec="seconds")
+        st.session_state.scan_status = fetcher.summarize(status)
+
+    # 시작 시(또는 배치 스캐너 python scanner.py 가 더 새로운 스냅샷을 만들었으면) 디스크의 최신 스냅샷으로 바로 표시
+    latest = scanner.latest_snapshot_path()
+    if latest and latest != st.session_state.get('snapshot_path'):
+        with metrics.stage("ui.warm_start"): snap = load_snapshot(latest)
+        if snap:
+            st.session_state.sniper_df, st.session_state.breaker_df = snap.sniper, snap.breaker
+            st.session_state.snapshot_time, st.session_state.scan_status = snap.created, snap.status
+            st.session_state.indicators = snap.indicators
+            st.session_state.snapshot_path = latest
+            st.session_state.scanned = True
+    if st.session_state.get('snapshot_time'): st.caption(f"📦 스캔 기준: {st.session_state.snapshot_time}")
+    overview = market_overview(st.session_state.indicators) if st.session_state.get('indicators') is not None else None
+    if overview: st.caption(overview)
+    failed = {k: v for k, v in st.session_state.get('scan_status', {}).items() if k != "ok"}
+    if failed: st.warning("⚠️ 수집 실패 종목: " + ", ".join(f"{k} {v}개" for k, v in failed.items()))
+
     if st.session_state.get('scanned'):
+        chart_years = st.radio("차트 기간", [1, 3, 5, 10], format_func=lambda y: f"{y}년", horizontal=True)
         t1_sub, t2_sub = st.tabs(["🛡️ 눌림목", "🚀 돌파"])
         with t1_sub:
             if not st.session_state.sniper_df.empty:
@@ -320,9 +134,7 @@ with tab1:
                 if len(st.session_state.g1.selection.rows) > 0:
                     row = st.session_state.sniper_df.iloc[st.session_state.g1.selection.rows[0]]
                     st.divider()
-                    ret, trades, df = run_backtest(row['코드'], row['종목명'], "Sniper")
-                    st.metric("1년 수익률", f"{ret:.1f}%")
-                    draw_chart_with_backtest(df, trades, row['종목명'])
+                    show_backtest(row, "Sniper", chart_years)
             else: st.info("없음")
         with t2_sub:
             if not st.session_state.breaker_df.empty:
@@ -330,27 +142,77 @@ with tab1:
                 if len(st.session_state.g2.selection.rows) > 0:
                     row = st.session_state.breaker_df.iloc[st.session_state.g2.selection.rows[0]]
                     st.divider()
-                    ret, trades, df = run_backtest(row['코드'], row['종목명'], "Breaker")
-                    st.metric("1년 수익률", f"{ret:.1f}%")
-                    draw_chart_with_backtest(df, trades, row['종목명'])
+                    show_backtest(row, "Breaker", chart_years)
             else: st.info("없음")
 
+        picked = pd.concat([st.session_state.sniper_df, st.session_state.breaker_df], ignore_index=True)
+        if not picked.empty:
+            compare = st.multiselect("📈 종목 비교 차트", picked['종목명'].tolist(), max_selections=10)
+            if compare:
+                import charts
+                codes = dict(zip(picked['종목명'], picked['코드']))
+                start = datetime.datetime.now() - datetime.timedelta(days=chart_years * 365)
+                scanner.backfill_store([codes[n] for n in compare], start)
+                fig = charts.build_overlay_figure({n: price_store.load(codes[n], start) for n in compare}, chart_years)
+                with metrics.stage("chart.render"): st.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("💼 포트폴리오 백테스트 (공유 자본)"):
+        c1, c2, c3 = st.columns(3)
+        pf_capital = c1.number_input("초기 자본(원)", min_value=1000000, value=portfolio.CAPITAL, step=1000000)
+        pf_slots = c2.number_input("최대 보유 종목 수", min_value=1, max_value=50, value=portfolio.MAX_POSITIONS)
+        pf_years = c3.selectbox("기간(년)", [1, 2, 3, 5], index=2)
+        pf_kinds = st.multiselect("전략", list(strategies.STRATEGIES), default=list(strategies.STRATEGIES), format_func=strategies.LABELS.get)
+        if st.button("▶️ 포트폴리오 실행") and pf_kinds:
+            with st.spinner("시뮬레이션 중..."):
+                codes = portfolio.prepare(get_stock_list(None if full_market else universe.TOP_N)['Code'].tolist(), pf_years)
+                result = portfolio.run(codes, pf_years, int(pf_capital), int(pf_slots), tuple(pf_kinds))
+            if result is None: st.info("없음")
+            else:
+                m = st.columns(4)
+                m[0].metric("총수익률", f"{result.stats['총수익률']:.1f}%"); m[1].metric("최대낙폭", f"{result.stats['최대낙폭']:.1f}%")
+                m[2].metric("청산 매매", result.stats['청산']); m[3].metric("승률", f"{result.stats['승률']:.1f}%")
+                st.line_chart(result.equity)
+                st.dataframe(result.trades, hide_index=True, use_container_width=True)
+
+    with st.expander("📡 실시간 스캔 (장중)"):
+        feed_path = st.text_input("피드 파일 (CSV: Date,Code,Close,Volume)", os.path.join("data", "replay.csv"))
+        feed_delay = st.slider("재생 간격(초)", 0.0, 1.0, 0.05)
+        if st.button("▶️ 스트리밍 시작"):
+            if not os.path.exists(feed_path): st.error("피드 파일 없음")
+            else:
+                import streaming
+                listing = get_stock_list(None)
+                names = dict(zip(listing['Code'], listing['Name']))
+                live = streaming.StreamingScanner()
+                live.seed_from_store(names)
+                board = st.empty(); fired = []
+                def show(sig):
+                    fired.insert(0, {"시각": datetime.datetime.fromtimestamp(sig.time).strftime("%H:%M:%S"), "종목명": names.get(sig.code, sig.code), "코드": sig.code,
+                                     "전략": strategies.LABELS[sig.type], "현재가": f"{int(sig.close):,}원"})
+                    board.dataframe(fired, hide_index=True, use_container_width=True)
+                live.run(streaming.ReplayFeed(feed_path, feed_delay), on_signal=show)
+                if not fired: st.info("신호 없음")
+
 with tab2:
-    url = st.text_input("뉴스 링크:")
+    urls = st.text_area("뉴스 링크 (여러 개는 줄바꿈으로 구분):")
     if st.button("🚀 분석"):
-        if api_key and url:
-            title, good, bad = analyze_news_with_gemini(api_key, url, get_stock_list())
-            if title.startswith("에러"): st.error(title)
-            else:
-                st.success(f"**{title}**")
-                c1, c2 = st.columns(2)
-                # [야간모드] 색상 변경: 진한 파랑/빨강 -> 연한 하늘/연한 빨강 (다크모드 가독성)
-                with c1:
-                    st.subheader("호재")
-                    for i in good: st.markdown(f"**{i['stock']}** <span style='color:#4DABF7'>({i['probability']}%)</span>: {i['reason']}", unsafe_allow_html=True)
-                with c2:
-                    st.subheader("악재")
-                    for i in bad: st.markdown(f"**{i['stock']}** <span style='color:#FF6B6B'>({i['probability']}%)</span>: {i['reason']}", unsafe_allow_html=True)
+        links = [u for u in urls.splitlines() if u.strip()]
+        if api_key and links:
+            import news
+            with st.spinner("분석 중..."):
+                results = news.analyze_many(links, get_stock_list(), news.GeminiClient(api_key))
+            for url, title, good, bad in results:
+                if title.startswith("에러"): st.error(f"{title} — {url}")
+                else:
+                    st.success(f"**{title}**")
+                    c1, c2 = st.columns(2)
+                    # [야간모드] 색상 변경: 진한 파랑/빨강 -> 연한 하늘/연한 빨강 (다크모드 가독성)
+                    with c1:
+                        st.subheader("호재")
+                        for i in good: st.markdown(f"**{i['stock']}** <span style='color:#4DABF7'>({i['probability']}%)</span>: {i['reason']}", unsafe_allow_html=True)
+                    with c2:
+                        st.subheader("악재")
+                        for i in bad: st.markdown(f"**{i['stock']}** <span style='color:#FF6B6B'>({i['probability']}%)</span>: {i['reason']}", unsafe_allow_html=True)
         else: st.error("키/링크 확인")
 
 with tab3:
@@ -369,7 +231,37 @@ with tab3:
                 max_idx = list(results.keys()).index(best_period)
                 colors[max_idx] = '#FF6B6B' # 강조색 (연한 빨강)
                 
+                import plotly.graph_objects as go
                 fig = go.Figure(data=[go.Bar(x=list(results.keys()), y=list(results.values()), marker_color=colors, text=[f"{v:.1f}%" for v in results.values()])])
                 fig.update_layout(height=300, title="보유 기간별 수익률", template='plotly_dark')
                 st.plotly_chart(fig, use_container_width=True)
                 st.success(f"💡 결론: **[{best_period}]** 보유 시 수익 극대화")
+
+    st.divider()
+    if st.button("🏆 전체 종목 최적 보유 기간 순위"):
+        import holding
+        with st.spinner("전 종목 분석 중..."):
+            ranking = holding.rank_universe(get_stock_list())
+        if ranking.empty: st.info("없음")
+        else: st.dataframe(ranking, hide_index=True, use_container_width=True)
+
+# -----------------------------------------------------------
+# [사이드바] 진단 패널 (스크립트 끝에서 그려 이번 실행의 계측까지 포함)
+# -----------------------------------------------------------
+with st.sidebar.expander("🩺 진단"):
+    metrics.enable(st.checkbox("계측 켜기", value=metrics.enabled()))
+    snap = metrics.snapshot()
+    if snap["stages"]:
+        st.caption("단계별 시간")
+        st.dataframe([{"단계": k, "호출": v["calls"], "합계(s)": round(v["total_s"], 3), "최대(s)": round(v["max_s"], 3)} for k, v in sorted(snap["stages"].items())], hide_index=True, use_container_width=True)
+    latency = snap["histograms"].get("fetch_latency_seconds")
+    if latency:
+        st.caption(f"종목별 수집 지연 (n={latency['count']})")
+        st.bar_chart({"종목 수": latency["buckets"]})
+    if snap["counters"]:
+        st.caption("카운터")
+        st.dataframe([{"이름": c["name"], "라벨": ", ".join(f"{k}={v}" for k, v in c["labels"].items()), "값": c["value"]} for c in snap["counters"]], hide_index=True, use_container_width=True)
+    c1, c2 = st.columns(2)
+    c1.download_button("JSON", metrics.to_json(), "metrics.json", "application/json")
+    c2.download_button("Prometheus", metrics.to_prometheus(), "metrics.prom", "text/plain")
+    if st.button("초기화"): metrics.reset()
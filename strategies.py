@@ -0,0 +1,34 @@
+import collections
+import numpy as np
+
+# -----------------------------------------------------------
+# 전략 정의 (스캐너 · 패널 · 백테스트 · 파라미터 스윕이 모두 이것만 사용)
+#   눌림목(Sniper): 정배열(MA20 > MA60) + 종가가 MA20 의 ±band 이내 + 거래량 < 5일 평균
+#   돌파(Breaker): 거래량 > 5일 평균 × vol_surge + 전일 대비 > min_change + 종가 > MA60
+#   청산: +take_profit 익절 / stop_loss 손절
+# 입력은 스칼라, 1-D(날짜), 2-D(날짜 × 종목) 배열 모두 가능. NaN 이 섞인 조건은 False.
+# -----------------------------------------------------------
+Params = collections.namedtuple("Params", ["band", "vol_surge", "min_change", "take_profit", "stop_loss"])
+DEFAULT = Params(band=0.03, vol_surge=1.5, min_change=0.02, take_profit=0.05, stop_loss=-0.03)
+STRATEGIES = ("Sniper", "Breaker")
+LABELS = {"Sniper": "눌림목", "Breaker": "돌파"}
+
+def sniper(close, volume, ma20, ma60, vol_ma5, change, p=DEFAULT):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (ma20 > ma60) & (np.abs(close - ma20) / ma20 <= p.band) & (volume < vol_ma5)
+
+def breaker(close, volume, ma20, ma60, vol_ma5, change, p=DEFAULT):
+    with np.errstate(invalid='ignore'):
+        return (volume > vol_ma5 * p.vol_surge) & (change > p.min_change) & (close > ma60)
+
+def entry_mask(strategy_type, close, volume, ma20, ma60, vol_ma5, change, p=DEFAULT):
+    if strategy_type == "Sniper": return sniper(close, volume, ma20, ma60, vol_ma5, change, p)
+    if strategy_type == "Breaker": return breaker(close, volume, ma20, ma60, vol_ma5, change, p)
+    return np.zeros(np.shape(close), dtype=bool)
+
+def levels(strategy_type, close, ma20, p=DEFAULT):
+    # 화면에 보여줄 (현재가, 손절가, 목표가). 눌림목은 MA20 아래로 내려와 있으면 -3%, 아니면 MA20 이 손절선
+    current_price = int(close)
+    stop_price = int(current_price * (1 + p.stop_loss))
+    if strategy_type == "Sniper" and current_price >= int(ma20): stop_price = int(ma20)
+    return current_price, stop_price, int(current_price * (1 + p.take_profit))
@@ -0,0 +1,118 @@
+import csv
+import time
+import datetime
+import collections
+import numpy as np
+import pandas as pd
+import price_store
+import strategies
+
+# -----------------------------------------------------------
+# 실시간(장중) 스캔
+#   종목마다 MA5/MA20/MA60/Vol_MA5 를 링버퍼 + 누적합으로 들고 있어서
+#   틱/봉이 들어올 때마다 O(1) 로 지표를 갱신하고 눌림목/돌파 조건을 다시 본다.
+#   같은 날짜의 업데이트는 '오늘 봉'을 덮어쓰고(장중 틱), 날짜가 바뀌면 새 봉으로 밀어 넣는다.
+#   피드는 Bar 를 내놓는 iterable 이면 무엇이든 되고, 테스트용으로 CSV 재생(ReplayFeed)을 둔다.
+# -----------------------------------------------------------
+Bar = collections.namedtuple("Bar", ["code", "date", "close", "volume"])
+Signal = collections.namedtuple("Signal", ["code", "date", "type", "close", "ma20", "time"])
+
+class RollingWindow:
+    # 고정 길이 window 의 합을 유지. push 는 새 칸, replace 는 마지막 칸 덮어쓰기 — 둘 다 O(1)
+    __slots__ = ("buf", "size", "pos", "count", "total")
+
+    def __init__(self, size):
+        self.buf = [0.0] * size; self.size = size
+        self.pos = 0; self.count = 0; self.total = 0.0
+
+    def push(self, value):
+        if self.count == self.size: self.total -= self.buf[self.pos]
+        else: self.count += 1
+        self.buf[self.pos] = value; self.total += value
+        self.pos = (self.pos + 1) % self.size
+
+    def replace(self, value):
+        last = (self.pos - 1) % self.size
+        self.total += value - self.buf[last]; self.buf[last] = value
+
+    def mean(self):
+        return self.total / self.size if self.count == self.size else np.nan
+
+class TickerState:
+    def __init__(self, code):
+        self.code = code
+        self.close5, self.close20, self.close60 = RollingWindow(5), RollingWindow(20), RollingWindow(60)
+        self.vol5 = RollingWindow(5)
+        self.date = None; self.close = np.nan; self.prev_close = np.nan; self.volume = np.nan
+
+    def seed(self, dates, closes, volumes):
+        for d, c, v in zip(dates, closes, volumes): self.update(d, c, v)
+
+    def update(self, date, close, volume):
+        # 이미 지난 날짜의 봉(과거 CSV 재생 등)은 버린다 → False
+        if self.date is not None and date < self.date: return False
+        if date == self.date:
+            for w in (self.close5, self.close20, self.close60): w.replace(close)
+            self.vol5.replace(volume)
+        else:
+            self.prev_close = self.close; self.date = date
+            for w in (self.close5, self.close20, self.close60): w.push(close)
+            self.vol5.push(volume)
+        self.close = close; self.volume = volume
+        return True
+
+    def columns(self):
+        # strategies.entry_mask 인자 순서: (Close, Volume, MA20, MA60, Vol_MA5, Change)
+        change = self.close / self.prev_close - 1 if self.prev_close else np.nan
+        return (self.close, self.volume, self.close20.mean(), self.close60.mean(), self.vol5.mean(), change)
+
+    def evaluate(self, p=strategies.DEFAULT):
+        cols = self.columns()
+        for kind in strategies.STRATEGIES:
+            if strategies.entry_mask(kind, *cols, p): return kind
+        return None
+
+class StreamingScanner:
+    # 업데이트마다 해당 종목만 다시 평가. 신호가 새로 켜질 때만 Signal 을 돌려준다
+    def __init__(self, p=strategies.DEFAULT):
+        self.p = p; self.states = {}; self.active = {}
+
+    def seed_from_store(self, codes, bars=60):
+        # 저장소의 최근 일봉으로 창을 채운다 (오늘 장중 업데이트는 그 위에 덮어씀)
+        for code in codes:
+            stored = price_store.read_arrays(code)
+            if stored is None: continue
+            dates, ohlcv = stored[0][-bars:], stored[1][:, -bars:]
+            state = self.states.setdefault(code, TickerState(code))
+            state.seed([pd.Timestamp(int(d)).date() for d in dates], ohlcv[3], ohlcv[4])
+
+    def on_bar(self, bar):
+        state = self.states.setdefault(bar.code, TickerState(bar.code))
+        if not state.update(bar.date, float(bar.close), float(bar.volume)): return None
+        kind = state.evaluate(self.p)
+        was = self.active.get(bar.code)
+        if kind: self.active[bar.code] = kind
+        else: self.active.pop(bar.code, None)
+        if kind and kind != was:
+            return Signal(bar.code, bar.date, kind, state.close, state.close20.mean(), time.time())
+        return None
+
+    def run(self, feed, on_signal=None):
+        fired = []
+        for bar in feed:
+            sig = self.on_bar(bar)
+            if sig:
+                fired.append(sig)
+                if on_signal: on_signal(sig)
+        return fired
+
+class ReplayFeed:
+    # CSV(Date,Code,Close,Volume) 를 순서대로 재생. delay 초만큼 쉬면서 장중처럼 흘려보낼 수 있다
+    def __init__(self, path, delay=0.0):
+        self.path = path; self.delay = delay
+
+    def __iter__(self):
+        with open(self.path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                yield Bar(row["Code"], datetime.date.fromisoformat(row["Date"][:10]), float(row["Close"]), float(row["Volume"]))
+                if self.delay: time.sleep(self.delay)
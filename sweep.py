@@ -0,0 +1,94 @@
+import os
+import sys
+import argparse
+import datetime
+import itertools
+import concurrent.futures
+import numpy as np
+import pandas as pd
+import price_store
+import backtest
+import strategies
+import universe
+import scanner
+
+# -----------------------------------------------------------
+# 파라미터 스윕 (눌림목/돌파 임계값 × 익절/손절 그리드)
+#   python sweep.py [--all] [--days 365] [--workers N]
+#   각 프로세스가 시작할 때 전 종목 지표를 한 번만 계산해 두고,
+#   조합마다 진입 마스크 + 청산 시뮬레이션만 다시 돈다.
+# -----------------------------------------------------------
+SWEEP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sweeps")
+GRID = {
+    "band": [0.02, 0.03, 0.04],
+    "vol_surge": [1.3, 1.5, 2.0],
+    "min_change": [0.0, 0.02, 0.03],
+    "take_profit": [0.03, 0.05, 0.08],
+    "stop_loss": [-0.02, -0.03, -0.05],
+}
+# 전략별로 실제로 쓰는 파라미터 (나머지는 기본값으로 고정해 중복 조합을 없앰)
+USES = {"Sniper": ("band", "take_profit", "stop_loss"), "Breaker": ("vol_surge", "min_change", "take_profit", "stop_loss")}
+
+def combinations(strategy_type, grid=GRID):
+    keys = USES[strategy_type]
+    for values in itertools.product(*(grid[k] for k in keys)):
+        yield strategies.DEFAULT._replace(**dict(zip(keys, values)))
+
+_data = []
+
+def _init(codes, start):
+    # 워커 프로세스마다 한 번: 저장소(memmap)에서 읽어 지표 배열을 만들어 둔다
+    global _data
+    _data = []
+    for code in codes:
+        df = price_store.load(code, start, refresh=False)
+        if len(df) <= backtest.WARMUP: continue
+        backtest.add_indicators(df)
+        _data.append((df.index, backtest.int_prices(df['Close']), df['Close'].iloc[-1], backtest.columns(df)))
+
+def _evaluate(task):
+    strategy_type, p = task
+    returns = []; wins = 0; sells = 0
+    for dates, prices, close_last, cols in _data:
+        ret, trades = backtest.simulate(dates, prices, close_last, strategies.entry_mask(strategy_type, *cols, p), p)
+        returns.append(ret)
+        for t in trades:
+            if t["type"] == "SELL":
+                sells += 1; wins += t["profit"] > 0
+    row = {"전략": strategy_type, **p._asdict()}
+    row.update({"평균수익률": float(np.mean(returns)) if returns else 0.0, "중앙값": float(np.median(returns)) if returns else 0.0,
+                "청산수": sells, "승률": wins / sells * 100 if sells else 0.0, "종목수": len(returns)})
+    return row
+
+def run_sweep(codes, days=365, workers=None, grid=GRID, strategy_types=strategies.STRATEGIES):
+    start = datetime.datetime.now() - datetime.timedelta(days=days)
+    tasks = [(s, p) for s in strategy_types for p in combinations(s, grid)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(list(codes), start)) as executor:
+        rows = list(executor.map(_evaluate, tasks, chunksize=max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))))
+    return pd.DataFrame(rows).sort_values("평균수익률", ascending=False).reset_index(drop=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="눌림목/돌파 파라미터 그리드를 전 종목에 백테스트합니다.")
+    parser.add_argument("--all", action="store_true", help="KOSPI/KOSDAQ 전 종목 (기본: 시총 상위 200)")
+    parser.add_argument("--days", type=int, default=365, help="백테스트 기간 (일)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--strategy", choices=strategies.STRATEGIES, default=None, help="한 전략만 스윕")
+    parser.add_argument("--top", type=int, default=10, help="전략별 상위 몇 개를 출력할지")
+    args = parser.parse_args(argv)
+
+    codes = universe.get_stock_list(None if args.all else universe.TOP_N)['Code'].tolist()
+    status = scanner.refresh_store(codes)
+    codes = [c for c in codes if status[c].status == "ok"]
+    result = run_sweep(codes, args.days, args.workers, strategy_types=(args.strategy,) if args.strategy else strategies.STRATEGIES)
+
+    os.makedirs(SWEEP_DIR, exist_ok=True)
+    path = os.path.join(SWEEP_DIR, f"sweep_{datetime.datetime.now():%Y%m%d_%H%M%S}.csv")
+    result.to_csv(path, index=False, encoding="utf-8-sig")
+    for s, group in result.groupby("전략", sort=False):
+        print(f"[{strategies.LABELS[s]}] 상위 {args.top}개")
+        print(group.head(args.top).to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print(f"→ {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import datetime
+import pytest
+import backtest
+import bench
+
+# -----------------------------------------------------------
+# 벡터화 엔진(backtest.simulate)이 예전 봉 단위 iloc 루프와 같은 매매 목록을 내는지 확인
+#   기준 루프는 원래 stock.run_backtest 를 그대로 옮긴 것 (조건·익절/손절 값도 하드코딩 그대로).
+#   단, 돌파는 전략 통합 이후 스캐너와 같은 '전일 대비 +2% 초과' 조건이 들어간다
+# -----------------------------------------------------------
+def reference(df, strategy_type):
+    balance = 1000000; shares = 0; trades = []
+    for i in range(60, len(df)):
+        today = df.iloc[i]; date = df.index[i]; price = int(today['Close'])
+        buy_signal = False
+        if strategy_type == "Sniper":
+            if (today['MA20'] > today['MA60']) and (abs(today['Close'] - today['MA20']) / today['MA20'] <= 0.03) and (today['Volume'] < today['Vol_MA5']): buy_signal = True
+        elif strategy_type == "Breaker":
+            if (today['Volume'] > today['Vol_MA5'] * 1.5) and (today['Change'] > 0.02) and (today['Close'] > today['MA60']): buy_signal = True
+
+        if shares == 0 and buy_signal:
+            shares = balance // price; balance -= shares * price; entry_price = price
+            trades.append({"date": date, "type": "BUY", "price": price})
+        elif shares > 0:
+            profit = (price - entry_price) / entry_price
+            if profit >= 0.05 or profit <= -0.03:
+                balance += shares * price; shares = 0
+                trades.append({"date": date, "type": "SELL", "price": price, "profit": profit * 100})
+    if shares > 0: balance += shares * df.iloc[-1]['Close']
+    return (balance - 1000000)/10000, trades
+
+def frame(i, scale=1.0):
+    df = bench.synthetic_reader(f"{i:06d}", datetime.date.today() - datetime.timedelta(days=365))
+    df[["Open", "High", "Low", "Close"]] *= scale
+    return df
+
+# scale=20 이면 종가가 자본(100만 원)을 넘는 종목이 생겨 '1주도 못 사는' 신호가 나온다
+CASES = [(i, 1.0) for i in range(150)] + [(i, 20.0) for i in range(150, 180)]
+
+@pytest.mark.parametrize("strategy_type", ["Sniper", "Breaker"])
+@pytest.mark.parametrize("i,scale", CASES)
+def test_simulate_matches_iloc_loop(i, scale, strategy_type):
+    expected_ret, expected = reference(backtest.add_indicators(frame(i, scale)), strategy_type)
+    ret, trades, _ = backtest.backtest_frame(frame(i, scale), strategy_type)
+    assert trades == expected
+    assert ret == pytest.approx(expected_ret)
+
+def test_zero_share_entries_are_covered():
+    # 위 케이스에 실제로 0주 매수가 들어 있어야 의미가 있다
+    zero = 0
+    for i, scale in CASES[150:]:
+        df = backtest.add_indicators(frame(i, scale))
+        for strategy_type in ("Sniper", "Breaker"):
+            _, trades = reference(df, strategy_type)
+            zero += sum(1 for t in trades if t["type"] == "BUY" and t["price"] > 1000000)
+    assert zero > 0
@@ -0,0 +1,46 @@
+import json
+import pandas as pd
+import pytest
+import news
+from cache import content_key
+
+# -----------------------------------------------------------
+# 뉴스 분석을 StubClient 로 오프라인 확인 (기사는 캐시에 미리 넣어 네트워크를 타지 않음)
+# -----------------------------------------------------------
+URL = "https://example.com/news/1"
+STOCKS = pd.DataFrame({"Code": ["005930", "000660", "373220", "005380"], "Name": ["삼성전자", "SK하이닉스", "LG에너지솔루션", "현대차"]})
+ANSWER = json.dumps({"good": [{"stock": "삼성전자", "reason": "HBM 공급", "probability": 80}], "bad": []}, ensure_ascii=False)
+
+@pytest.fixture(autouse=True)
+def caches():
+    news.articles.clear(); news.responses.clear()
+    news.articles.set(content_key("article", URL), ("삼성전자, HBM 공급 확대", "삼성전자와 SK하이닉스가 HBM 공급을 늘린다."))
+    yield
+    news.articles.clear(); news.responses.clear()
+
+def test_repeated_analysis_uses_cached_response():
+    client = news.StubClient(ANSWER)
+    first = news.analyze_news(URL, STOCKS, client)
+    second = news.analyze_news(URL, STOCKS, client)
+    assert first == second == ("삼성전자, HBM 공급 확대", json.loads(ANSWER)["good"], [])
+    assert client.calls == 1
+
+def test_prompt_only_lists_mentioned_names():
+    prompts = []
+    def respond(prompt):
+        prompts.append(prompt); return ANSWER
+    news.analyze_news(URL, STOCKS, news.StubClient(respond))
+    assert "관심종목: 삼성전자, SK하이닉스\n" in prompts[0]
+
+def test_candidates_narrow_the_name_list():
+    names = STOCKS['Name'].tolist()
+    assert news.candidates("현대차 신차", "현대차가 전기차를 내놓았다", names) == ["현대차"]
+    assert news.candidates("반도체", "삼성전자 SK하이닉스 모두 강세", names) == ["삼성전자", "SK하이닉스"]
+    assert news.candidates("금리 동결", "한국은행이 금리를 동결했다", names) == names  # 언급 없으면 전체
+
+def test_invalid_response_is_not_cached():
+    client = news.StubClient("not json")
+    title, good, bad = news.analyze_news(URL, STOCKS, client)
+    assert title.startswith("에러") and good == bad == []
+    news.analyze_news(URL, STOCKS, client)
+    assert client.calls == 2
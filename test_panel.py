@@ -0,0 +1,71 @@
+import datetime
+import numpy as np
+import pandas as pd
+import pytest
+import backtest
+import bench
+import panel
+
+# -----------------------------------------------------------
+# 패널 지표가 종목별 DataFrame(pandas rolling)과 같은 값인지 확인.
+#   날짜축은 전 종목의 합집합이라, 한 종목만 빠진 날(거래정지)이나 늦게 갱신된 종목이 섞여도
+#   그 종목 자기 봉으로 계산돼야 한다
+# -----------------------------------------------------------
+CODES = [f"{i:06d}" for i in range(8)]
+
+def frames(drop=None):
+    # drop: {코드: 지울 행 위치 목록}
+    start = datetime.date.today() - datetime.timedelta(days=300)
+    out = {}
+    for code in CODES:
+        df = bench.synthetic_reader(code, start)
+        if drop and code in drop: df = df.drop(df.index[drop[code]])
+        out[code] = df
+    return out
+
+def to_panel(dfs):
+    axis = sorted(set().union(*(df.index for df in dfs.values())))
+    close = pd.DataFrame({c: df['Close'] for c, df in dfs.items()}).reindex(axis)
+    volume = pd.DataFrame({c: df['Volume'] for c, df in dfs.items()}).reindex(axis)
+    return panel.Panel(pd.DatetimeIndex(axis, name="Date"), list(dfs), close.to_numpy(), volume.to_numpy())
+
+def expected(df):
+    df = backtest.add_indicators(df.copy())
+    df['MA5'] = df['Close'].rolling(5).mean()
+    return df
+
+def assert_column_matches(market, ind, j, df):
+    rows = market.dates.get_indexer(df.index)
+    for name, col in (("ma5", "MA5"), ("ma20", "MA20"), ("ma60", "MA60"), ("vol_ma5", "Vol_MA5"), ("change", "Change")):
+        np.testing.assert_allclose(getattr(ind, name)[rows, j], df[col].to_numpy(), rtol=1e-12, err_msg=name)
+    others = np.setdiff1d(np.arange(len(market.dates)), rows)
+    assert np.isnan(ind.ma20[others, j]).all()
+
+@pytest.mark.parametrize("gap", [[-10], [-3, -25, -70], [5]])
+def test_gapped_ticker_uses_its_own_bars(gap):
+    dfs = frames({"000002": gap})
+    market = to_panel(dfs)
+    ind = panel.indicators(market)
+    for j, code in enumerate(CODES): assert_column_matches(market, ind, j, expected(dfs[code]))
+    j = CODES.index("000002")
+    assert not np.isnan(ind.ma60[-1, j])
+
+def test_latest_uses_each_tickers_last_bar():
+    dfs = frames()
+    dfs["000000"] = dfs["000000"].iloc[:-3]  # 3봉 늦게 갱신된 종목
+    dfs["000001"] = dfs["000001"].drop(dfs["000001"].index[-15])  # 최근 거래정지 하루
+    market = to_panel(dfs)
+    close, volume, ind = panel.latest(market)
+    for j, code in enumerate(CODES):
+        last = expected(dfs[code]).iloc[-1]
+        got = (close[j], volume[j], ind.ma5[j], ind.ma20[j], ind.ma60[j], ind.vol_ma5[j], ind.change[j])
+        np.testing.assert_allclose(got, last[['Close', 'Volume', 'MA5', 'MA20', 'MA60', 'Vol_MA5', 'Change']].to_numpy(dtype=float), rtol=1e-12)
+
+def test_latest_with_short_history():
+    dfs = frames()
+    dfs["000003"] = dfs["000003"].iloc[-30:]  # 신규 상장 — MA60 은 아직 NaN
+    market = to_panel(dfs)
+    _, _, ind = panel.latest(market)
+    j = CODES.index("000003")
+    assert np.isnan(ind.ma60[j])
+    assert ind.ma20[j] == pytest.approx(dfs["000003"]['Close'].iloc[-20:].mean())
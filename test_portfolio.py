@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import panel
+import portfolio
+
+# -----------------------------------------------------------
+# 공유 자본 시뮬레이션: 슬롯 · 자본 배분 규칙
+# -----------------------------------------------------------
+def flat_market(prices, days=70):
+    close = np.tile(np.asarray(prices, dtype=float), (days, 1))
+    return panel.Panel(pd.bdate_range("2026-01-01", periods=days, name="Date"), [f"{j:06d}" for j in range(len(prices))], close, np.ones_like(close))
+
+def test_unaffordable_signal_does_not_use_a_slot():
+    # 예산(자본/슬롯 = 50만)보다 비싼 첫 종목은 건너뛰고 뒤의 살 수 있는 종목으로 슬롯을 채운다
+    market = flat_market([900000, 1000, 2000, 3000])
+    signal = np.zeros(market.close.shape, dtype=bool); signal[60] = True
+    _, trades = portfolio.simulate(market, signal, capital=1000000, max_positions=2)
+    assert [(t, j, side) for t, j, side, *_ in trades] == [(60, 1, "BUY"), (60, 2, "BUY")]
+
+def test_slots_limit_entries():
+    market = flat_market([1000] * 5)
+    signal = np.zeros(market.close.shape, dtype=bool); signal[60] = True
+    _, trades = portfolio.simulate(market, signal, capital=1000000, max_positions=3)
+    assert [j for _, j, *_ in trades] == [0, 1, 2]
@@ -0,0 +1,113 @@
+import os
+import datetime
+import pandas as pd
+import pytest
+import price_store
+import scanner
+
+# -----------------------------------------------------------
+# 저장소 갱신 규칙: 장 마감(15:30 KST) 기준 신선도, 장중 봉 교체, 빈 응답 = 수집 실패
+# -----------------------------------------------------------
+KST = price_store.KST
+
+def at(y, m, d, hh, mm=0):
+    return datetime.datetime(y, m, d, hh, mm, tzinfo=KST)
+
+def bars(start, end, last_close=100.0):
+    index = pd.bdate_range(start, end, name="Date")
+    df = pd.DataFrame({c: 100.0 for c in price_store.COLUMNS}, index=index)
+    if len(df): df.iloc[-1, price_store.COLUMNS.index("Close")] = last_close
+    return df
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(price_store, "STORE_DIR", str(tmp_path))
+    yield tmp_path
+    price_store.set_reader(None)
+
+def stamp(code, when):
+    os.utime(price_store._paths(code)[0], (when.timestamp(), when.timestamp()))
+
+@pytest.mark.parametrize("now,expected", [
+    (at(2026, 10, 14, 15, 29), at(2026, 10, 13, 15, 30)),  # 수요일 마감 직전 → 화요일 마감
+    (at(2026, 10, 14, 15, 30), at(2026, 10, 14, 15, 30)),  # 마감 시각 그대로
+    (at(2026, 10, 17, 12), at(2026, 10, 16, 15, 30)),      # 토요일 → 금요일 마감
+    (at(2026, 10, 18, 20), at(2026, 10, 16, 15, 30)),      # 일요일 저녁 → 금요일 마감
+    (at(2026, 10, 19, 9), at(2026, 10, 16, 15, 30)),       # 월요일 장중 → 금요일 마감
+    (datetime.datetime(2026, 10, 14, 6, 31, tzinfo=datetime.timezone.utc), at(2026, 10, 14, 15, 30)),  # UTC 입력
+])
+def test_last_close(now, expected):
+    assert price_store.last_close(now) == expected
+
+def test_is_fresh_around_close(store):
+    price_store.set_reader(lambda code, start, end=None: bars(start, "2026-10-14"))
+    price_store.update("A", at(2026, 10, 14, 10))
+    stamp("A", at(2026, 10, 14, 10))
+    assert price_store.is_fresh("A", at(2026, 10, 14, 15, 29))
+    assert not price_store.is_fresh("A", at(2026, 10, 14, 15, 31))
+    stamp("A", at(2026, 10, 16, 16))  # 금요일 마감 후 수집 → 주말 내내 신선
+    assert price_store.is_fresh("A", at(2026, 10, 18, 20))
+    assert not price_store.is_fresh("A", at(2026, 10, 19, 15, 31))
+
+def test_intraday_bar_is_replaced_after_close(store):
+    close = {"value": 90.0}
+    price_store.set_reader(lambda code, start, end=None: bars(start, "2026-10-14", close["value"]))
+    price_store.update("A", at(2026, 10, 14, 10))
+    stamp("A", at(2026, 10, 14, 10))
+    n = len(price_store.read_arrays("A")[0])
+    close["value"] = 100.0
+    assert price_store.update("A", at(2026, 10, 14, 16))
+    dates, ohlcv = price_store.read_arrays("A")
+    assert len(dates) == n and ohlcv[3, -1] == 100.0
+
+def test_empty_refresh_is_a_failure(store, monkeypatch):
+    # 정상 응답에는 마지막 저장일 봉이 들어 있으므로 빈 응답은 실패 → 신선 표시 없이 fetcher 가 error 로 집계
+    price_store.set_reader(lambda code, start, end=None: bars(start, "2026-10-14"))
+    price_store.update("A", at(2026, 10, 14, 10))
+    stamp("A", at(2026, 10, 14, 10))
+    price_store.set_reader(lambda code, start, end=None: bars(start, start)[:0])
+    with pytest.raises(RuntimeError):
+        price_store.update("A", at(2026, 10, 14, 16))
+    assert not price_store.is_fresh("A", at(2026, 10, 14, 16))
+    monkeypatch.setattr(scanner.fetcher, "BACKOFF", 0)
+    assert scanner.refresh_store(["A"])["A"].status == "error"
+
+def test_backfill_requests_only_the_missing_range(store):
+    calls = []
+    def reader(code, start, end=None):
+        calls.append((pd.Timestamp(start), None if end is None else pd.Timestamp(end)))
+        return bars(start, end or "2026-10-14")
+    price_store.set_reader(reader)
+    price_store.update("A", at(2026, 10, 14, 16))
+    first = pd.Timestamp(int(price_store.read_arrays("A")[0][0]))
+    calls.clear()
+    assert price_store.backfill("A", datetime.date(2020, 1, 1))
+    # 저장된 구간은 다시 받지 않는다 — 끝은 정상 응답 확인용 첫 봉 하루뿐
+    assert calls == [(pd.Timestamp("2020-01-01"), first)]
+    dates = price_store.read_arrays("A")[0]
+    assert pd.Timestamp(int(dates[0])) == pd.Timestamp("2020-01-01") and len(set(dates)) == len(dates)
+    calls.clear()
+    assert not price_store.backfill("A", datetime.date(2021, 1, 1))
+    assert calls == []
+
+def test_failed_backfill_is_retried_later(store, monkeypatch):
+    price_store.set_reader(lambda code, start, end=None: bars(start, end or "2026-10-14"))
+    price_store.update("A", at(2026, 10, 14, 16))
+    first = int(price_store.read_arrays("A")[0][0])
+    price_store.set_reader(lambda code, start, end=None: bars(start, start)[:0])
+    with pytest.raises(RuntimeError):
+        price_store.backfill("A", datetime.date(2020, 1, 1))
+    assert price_store.needs_backfill("A", datetime.date(2020, 1, 1))
+    assert int(price_store.read_arrays("A")[0][0]) == first
+    monkeypatch.setattr(scanner.fetcher, "BACKOFF", 0)
+    assert scanner.backfill_store(["A"], datetime.date(2020, 1, 1))["A"].status == "error"
+    price_store.set_reader(lambda code, start, end=None: bars(start, end or "2026-10-14"))
+    assert scanner.backfill_store(["A"], datetime.date(2020, 1, 1))["A"].status == "ok"
+    assert not price_store.needs_backfill("A", datetime.date(2020, 1, 1))
+
+def test_backfill_before_listing_is_not_repeated(store):
+    # 신규 상장: 첫 봉 이전엔 데이터가 없어도 첫 봉은 돌아오므로 성공 → .since 로 다시 받지 않음
+    price_store.set_reader(lambda code, start, end=None: bars(max(pd.Timestamp(start), pd.Timestamp("2026-06-01")), end or "2026-10-14"))
+    price_store.update("A", at(2026, 10, 14, 16))
+    assert price_store.backfill("A", datetime.date(2020, 1, 1))
+    assert not price_store.needs_backfill("A", datetime.date(2020, 1, 1))
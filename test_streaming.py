@@ -0,0 +1,50 @@
+import datetime
+import numpy as np
+import pandas as pd
+import bench
+import panel
+import streaming
+
+# -----------------------------------------------------------
+# 스트리밍 지표(링버퍼)가 패널 배치 계산(panel.latest / panel.scan)과 매 봉 같은지 확인
+# -----------------------------------------------------------
+CODES = [f"{i:06d}" for i in range(12)]
+
+def market():
+    start = datetime.date.today() - datetime.timedelta(days=400)
+    dfs = {code: bench.synthetic_reader(code, start) for code in CODES}
+    close = pd.DataFrame({c: df['Close'] for c, df in dfs.items()})
+    volume = pd.DataFrame({c: df['Volume'] for c, df in dfs.items()})
+    return panel.Panel(pd.DatetimeIndex(close.index, name="Date"), CODES, close.to_numpy(), volume.to_numpy())
+
+def upto(m, t):
+    return panel.Panel(m.dates[:t + 1], m.codes, m.close[:t + 1], m.volume[:t + 1])
+
+def test_streaming_matches_panel_every_bar():
+    m = market()
+    live = streaming.StreamingScanner()
+    for j, code in enumerate(CODES):
+        live.states[code] = streaming.TickerState(code)
+        live.states[code].seed([d.date() for d in m.dates[:60]], m.close[:60, j], m.volume[:60, j])
+    for t in range(60, len(m.dates)):
+        for j, code in enumerate(CODES):
+            # 장중 임시 값 → 같은 날짜 확정 값으로 덮어쓰기
+            live.on_bar(streaming.Bar(code, m.dates[t].date(), m.close[t, j] * 1.01, m.volume[t, j] / 2))
+            live.on_bar(streaming.Bar(code, m.dates[t].date(), m.close[t, j], m.volume[t, j]))
+        close, volume, ind = panel.latest(upto(m, t))
+        got = np.array([live.states[c].columns() for c in CODES])
+        want = np.column_stack([close, volume, ind.ma20, ind.ma60, ind.vol_ma5, ind.change])
+        np.testing.assert_allclose(got, want, rtol=1e-9)
+        hits = {code: kind for kind, code, _, _ in panel.scan(upto(m, t))}
+        assert {c: live.states[c].evaluate() for c in CODES if live.states[c].evaluate()} == hits
+
+def test_older_bars_are_ignored():
+    m = market()
+    state = streaming.TickerState(CODES[0])
+    state.seed([d.date() for d in m.dates[:100]], m.close[:100, 0], m.volume[:100, 0])
+    before = (state.date, state.columns())
+    assert not state.update(m.dates[50].date(), m.close[50, 0] * 2, m.volume[50, 0])
+    assert (state.date, state.columns()) == before
+    live = streaming.StreamingScanner(); live.states[CODES[0]] = state
+    assert live.on_bar(streaming.Bar(CODES[0], m.dates[10].date(), 1.0, 1.0)) is None
+    assert (state.date, state.columns()) == before